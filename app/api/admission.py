@@ -0,0 +1,43 @@
+"""Limit of commands handled at the same time."""
+
+from typing import Dict
+
+from app.bot.bot_with_help import BotWithHelp
+
+
+class AdmissionController:
+    def __init__(self, bot: BotWithHelp, max_in_flight_commands: int) -> None:
+        self._bot = bot
+        self._max_in_flight_commands = max_in_flight_commands
+        self._rejected_commands_count = 0
+        self._is_closed = False
+
+    @property
+    def is_closed(self) -> bool:
+        return self._is_closed
+
+    def close(self) -> None:
+        """Stop admitting commands, e.g. before shutdown."""
+        self._is_closed = True
+
+    def admit(self) -> bool:
+        """Check if one more command can be handled right now."""
+        if self._is_closed:
+            self._rejected_commands_count += 1
+            return False
+
+        if not self._max_in_flight_commands:
+            return True
+
+        if self._bot.active_tasks_count < self._max_in_flight_commands:
+            return True
+
+        self._rejected_commands_count += 1
+        return False
+
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            "in_flight_commands": self._bot.active_tasks_count,
+            "max_in_flight_commands": self._max_in_flight_commands,
+            "rejected_commands": self._rejected_commands_count,
+        }
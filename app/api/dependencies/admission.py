@@ -0,0 +1,14 @@
+"""Admission controller dependency for FastAPI."""
+
+from fastapi import Depends, Request
+
+from app.api.admission import AdmissionController
+
+
+def get_admission_controller(request: Request) -> AdmissionController:
+    assert isinstance(request.app.state.admission_controller, AdmissionController)
+
+    return request.app.state.admission_controller
+
+
+admission_controller_dependency = Depends(get_admission_controller)
@@ -1,11 +1,12 @@
 """Bot dependency for FastAPI."""
 
 from fastapi import Depends, Request
-from pybotx import Bot
 
+from app.bot.bot_with_help import BotWithHelp
 
-def get_bot(request: Request) -> Bot:
-    assert isinstance(request.app.state.bot, Bot)
+
+def get_bot(request: Request) -> BotWithHelp:
+    assert isinstance(request.app.state.bot, BotWithHelp)
 
     return request.app.state.bot
 
@@ -1,74 +1,197 @@
 """Endpoints for communication with botx."""
 
 from http import HTTPStatus
+from typing import Any, Dict, List, Mapping, Optional, Tuple
 
-from fastapi import APIRouter, Request
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, Request, Response
 from pybotx import (
     Bot,
     BotXMethodCallbackNotFoundError,
     UnknownBotAccountError,
     UnknownSystemEventError,
     UnverifiedRequestError,
-    build_bot_disabled_response,
-    build_command_accepted_response,
-    build_unverified_request_response,
 )
 
+from app.api.admission import AdmissionController
+from app.api.dependencies.admission import admission_controller_dependency
 from app.api.dependencies.bot import bot_dependency
+from app.api.serialization import (
+    ENCODED_COMMAND_ACCEPTED,
+    FastJSONResponse,
+    bot_disabled_response,
+    command_accepted_response,
+    encode_bot_disabled,
+    encode_unverified_request,
+    encoded_response,
+    read_json,
+)
 from app.logger import logger
+from app.settings import settings
 
 router = APIRouter()
 
+TOO_MANY_COMMANDS_LABEL = "Too many commands in progress, try again later"
+VALIDATION_ERROR_LABEL = "Bot command validation error"
+SHUTTING_DOWN_LABEL = "Bot is shutting down, try again later"
 
-@router.post("/command")
-async def command_handler(request: Request, bot: Bot = bot_dependency) -> JSONResponse:
-    """Receive commands from users. Max timeout - 5 seconds."""
-    logger.debug(f"Command headers: {request.headers}")
+# Status code and encoded response payload
+CommandResult = Tuple[int, bytes]
+# Raw command and headers of its original request
+ParsedBatchItem = Tuple[Any, Dict[str, str]]
+
+VALIDATION_ERROR_RESULT: CommandResult = (
+    HTTPStatus.SERVICE_UNAVAILABLE,
+    encode_bot_disabled(VALIDATION_ERROR_LABEL),
+)
+
+
+def execute_raw_bot_command(
+    bot: Bot, raw_bot_command: Any, request_headers: Mapping[str, str]
+) -> CommandResult:
+    """Pass raw command to bot and map errors to BotX responses."""
     try:  # noqa: WPS225
         bot.async_execute_raw_bot_command(
-            await request.json(),
-            request_headers=request.headers,
+            raw_bot_command,
+            request_headers=request_headers,
         )
     except UnknownSystemEventError as unknown_event_exc:
         logger.warning(f"Received unknown system event `{unknown_event_exc.type_name}`")
 
         # It's not an error, bot shouldn't fail on new system events
-        return JSONResponse(
-            build_command_accepted_response(), status_code=HTTPStatus.ACCEPTED
-        )
+        return HTTPStatus.ACCEPTED, ENCODED_COMMAND_ACCEPTED
     except ValueError:
-        error_label = "Bot command validation error"
-        logger.exception(error_label)
+        logger.exception(VALIDATION_ERROR_LABEL)
 
-        return JSONResponse(
-            build_bot_disabled_response(error_label),
-            status_code=HTTPStatus.SERVICE_UNAVAILABLE,
-        )
+        return VALIDATION_ERROR_RESULT
     except UnknownBotAccountError as exc:
         error_label = f"No credentials for bot {exc.bot_id}"
         logger.warning(error_label)
 
-        return JSONResponse(
-            build_bot_disabled_response(error_label),
-            status_code=HTTPStatus.SERVICE_UNAVAILABLE,
-        )
+        return HTTPStatus.SERVICE_UNAVAILABLE, encode_bot_disabled(error_label)
     except UnverifiedRequestError as exc:
         logger.warning(f"UnverifiedRequestError: {exc.args[0]}")
-        return JSONResponse(
-            content=build_unverified_request_response(
-                status_message=exc.args[0],
-            ),
-            status_code=HTTPStatus.UNAUTHORIZED,
+        return HTTPStatus.UNAUTHORIZED, encode_unverified_request(exc.args[0])
+
+    return HTTPStatus.ACCEPTED, ENCODED_COMMAND_ACCEPTED
+
+
+def _get_rejection_label(admission_controller: AdmissionController) -> Optional[str]:
+    if admission_controller.admit():
+        return None
+
+    if admission_controller.is_closed:
+        return SHUTTING_DOWN_LABEL
+
+    return TOO_MANY_COMMANDS_LABEL
+
+
+def _parse_batch_item(raw_batch_item: Dict[str, Any]) -> ParsedBatchItem:
+    raw_headers = raw_batch_item.get("headers")
+    if not isinstance(raw_headers, dict):
+        raw_headers = {}
+
+    # Headers in JSON are case-sensitive unlike HTTP ones
+    request_headers = {
+        str(header).lower(): str(header_value)
+        for header, header_value in raw_headers.items()
+    }
+
+    return raw_batch_item.get("command"), request_headers
+
+
+def _execute_batch_item(
+    bot: Bot, admission_controller: AdmissionController, raw_batch_item: Any
+) -> CommandResult:
+    rejection_label = _get_rejection_label(admission_controller)
+    if rejection_label is not None:
+        return HTTPStatus.SERVICE_UNAVAILABLE, encode_bot_disabled(rejection_label)
+
+    if not isinstance(raw_batch_item, dict):
+        logger.warning(f"{VALIDATION_ERROR_LABEL}: batch item should be an object")
+        return VALIDATION_ERROR_RESULT
+
+    raw_bot_command, request_headers = _parse_batch_item(raw_batch_item)
+
+    return execute_raw_bot_command(bot, raw_bot_command, request_headers)
+
+
+@router.post("/command")
+async def command_handler(
+    request: Request,
+    bot: Bot = bot_dependency,
+    admission_controller: AdmissionController = admission_controller_dependency,
+) -> Response:
+    """Receive commands from users. Max timeout - 5 seconds."""
+    rejection_label = _get_rejection_label(admission_controller)
+    if rejection_label is not None:
+        logger.debug(rejection_label)
+
+        response = bot_disabled_response(rejection_label)
+        response.headers["Retry-After"] = str(settings.RETRY_AFTER_SECONDS)
+        return response
+
+    logger.opt(lazy=True).debug(
+        "Command headers: {headers}", headers=lambda: request.headers
+    )
+    try:
+        raw_bot_command = await read_json(request)
+    except ValueError:
+        logger.exception(VALIDATION_ERROR_LABEL)
+        status_code, response_content = VALIDATION_ERROR_RESULT
+    else:
+        status_code, response_content = execute_raw_bot_command(
+            bot, raw_bot_command, request.headers
         )
 
-    return JSONResponse(
-        build_command_accepted_response(), status_code=HTTPStatus.ACCEPTED
+    return encoded_response(response_content, status_code)
+
+
+@router.post("/commands/batch")
+async def batch_command_handler(
+    request: Request,
+    bot: Bot = bot_dependency,
+    admission_controller: AdmissionController = admission_controller_dependency,
+) -> Response:
+    """Receive list of commands for traffic replay and load testing.
+
+    Each item should look like `{"command": {...}, "headers": {...}}`, where
+    `headers` are the headers of the original `/command` request.
+    """
+    try:
+        raw_batch = await read_json(request)
+    except ValueError:
+        logger.exception(VALIDATION_ERROR_LABEL)
+        return bot_disabled_response(VALIDATION_ERROR_LABEL)
+
+    if not isinstance(raw_batch, list):
+        logger.warning(f"{VALIDATION_ERROR_LABEL}: batch should be a list")
+        return bot_disabled_response(VALIDATION_ERROR_LABEL)
+
+    batch_results: List[bytes] = []
+    for raw_batch_item in raw_batch:
+        status_code, response_content = _execute_batch_item(
+            bot, admission_controller, raw_batch_item
+        )
+        # Responses are already encoded, so the batch result is glued manually
+        batch_results.append(
+            b"".join(
+                (
+                    b'{"status_code":',
+                    str(status_code).encode(),
+                    b',"result":',
+                    response_content,
+                    b"}",
+                )
+            )
+        )
+
+    return encoded_response(
+        b"".join((b"[", b",".join(batch_results), b"]")), HTTPStatus.OK
     )
 
 
 @router.get("/status")
-async def status_handler(request: Request, bot: Bot = bot_dependency) -> JSONResponse:
+async def status_handler(request: Request, bot: Bot = bot_dependency) -> Response:
     try:
         status = await bot.raw_get_status(
             dict(request.query_params),
@@ -78,39 +201,32 @@ async def status_handler(request: Request, bot: Bot = bot_dependency) -> JSONRes
         error_label = f"Unknown bot_id: {exc.bot_id}"
         logger.warning(error_label)
 
-        return JSONResponse(
-            build_bot_disabled_response(error_label),
-            status_code=HTTPStatus.SERVICE_UNAVAILABLE,
-        )
+        return bot_disabled_response(error_label)
     except UnverifiedRequestError as exc:
         logger.warning(f"UnverifiedRequestError: {exc.args[0]}")
-        return JSONResponse(
-            content=build_unverified_request_response(
-                status_message=exc.args[0],
-            ),
-            status_code=HTTPStatus.UNAUTHORIZED,
+        return encoded_response(
+            encode_unverified_request(exc.args[0]), HTTPStatus.UNAUTHORIZED
         )
 
-    return JSONResponse(status)
+    return FastJSONResponse(status)
 
 
 @router.post("/notification/callback")
-async def callback_handler(request: Request, bot: Bot = bot_dependency) -> JSONResponse:
+async def callback_handler(request: Request, bot: Bot = bot_dependency) -> Response:
     try:
         await bot.set_raw_botx_method_result(
-            await request.json(),
+            await read_json(request),
             verify_request=False,
         )
     except BotXMethodCallbackNotFoundError as exc:
         error_label = f"Unexpected callback with sync_id: {exc.sync_id}"
         logger.warning(error_label)
 
-        return JSONResponse(
-            build_bot_disabled_response(error_label),
-            status_code=HTTPStatus.SERVICE_UNAVAILABLE,
-        )
+        return bot_disabled_response(error_label)
+    except ValueError:
+        error_label = "BotX method callback validation error"
+        logger.exception(error_label)
 
-    return JSONResponse(
-        build_command_accepted_response(),
-        status_code=HTTPStatus.ACCEPTED,
-    )
+        return bot_disabled_response(error_label)
+
+    return command_accepted_response()
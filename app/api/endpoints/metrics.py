@@ -0,0 +1,15 @@
+"""Endpoint for Prometheus metrics."""
+
+from fastapi import APIRouter, Response
+
+from app.metrics import registry
+
+router = APIRouter()
+
+# Starlette appends charset to `text/*` media types
+PROMETHEUS_MEDIA_TYPE = "text/plain; version=0.0.4"
+
+
+@router.get("/metrics")
+async def metrics_handler() -> Response:
+    return Response(registry.render(), media_type=PROMETHEUS_MEDIA_TYPE)
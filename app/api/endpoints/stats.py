@@ -0,0 +1,33 @@
+"""Endpoints for runtime statistics."""
+
+from fastapi import APIRouter, Response
+
+from app.api.admission import AdmissionController
+from app.api.dependencies.admission import admission_controller_dependency
+from app.api.dependencies.bot import bot_dependency
+from app.api.serialization import FastJSONResponse
+from app.bot.bot_with_help import BotWithHelp
+from app.bot.middlewares.debug_messages import debug_mirror
+
+router = APIRouter()
+
+
+@router.get("/stats")
+async def stats_handler(
+    bot: BotWithHelp = bot_dependency,
+    admission_controller: AdmissionController = admission_controller_dependency,
+) -> Response:
+    return FastJSONResponse(
+        {
+            "admission": admission_controller.get_stats(),
+            "status_cache": bot.status_cache.get_stats(),
+            "callbacks": bot.callback_stats.get_stats(),
+            "debug_mirror": debug_mirror.get_stats(),
+            "dispatch": (
+                bot.dispatch_scheduler.get_stats() if bot.dispatch_scheduler else {}
+            ),
+            "outbound": (
+                bot.outbound_scheduler.get_stats() if bot.outbound_scheduler else {}
+            ),
+        }
+    )
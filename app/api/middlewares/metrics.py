@@ -0,0 +1,47 @@
+"""ASGI middleware to measure requests duration."""
+
+from time import perf_counter
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.metrics import REQUEST_DURATION
+
+UNMATCHED_PATH_LABEL = "<unmatched>"
+
+
+class StatusCodeRecorder:
+    """Send wrapper remembering response status code."""
+
+    def __init__(self, send: Send) -> None:
+        self._send = send
+        self.status_code = 500
+
+    async def __call__(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            self.status_code = message["status"]
+
+        await self._send(message)
+
+
+class RequestMetricsMiddleware:
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code_recorder = StatusCodeRecorder(send)
+        started_at = perf_counter()
+        try:  # noqa: WPS501
+            await self.app(scope, receive, status_code_recorder)
+        finally:
+            # Route is stored in scope by router, raw path isn't used as label
+            # to keep number of time series bounded
+            route = scope.get("route")
+            REQUEST_DURATION.observe(
+                perf_counter() - started_at,
+                route.path if route else UNMATCHED_PATH_LABEL,
+                str(status_code_recorder.status_code),
+            )
@@ -3,7 +3,11 @@
 from fastapi import APIRouter
 
 from app.api.endpoints.botx import router as bot_router
+from app.api.endpoints.metrics import router as metrics_router
+from app.api.endpoints.stats import router as stats_router
 
 router = APIRouter()
 
 router.include_router(bot_router, tags=["Bot API"])
+router.include_router(stats_router, tags=["Stats"])
+router.include_router(metrics_router, tags=["Stats"])
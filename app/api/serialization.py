@@ -0,0 +1,88 @@
+"""Fast JSON encoding and decoding for BotX endpoints.
+
+`orjson` is used when it is installed, otherwise stdlib `json` is used.
+"""
+
+import json
+from functools import lru_cache
+from http import HTTPStatus
+from typing import Any
+
+from fastapi import Request
+from fastapi.responses import Response
+from pybotx import (
+    build_bot_disabled_response,
+    build_command_accepted_response,
+    build_unverified_request_response,
+)
+
+try:
+    import orjson  # noqa: WPS433
+except ImportError:  # Optional dependency, install `speedups` extra to use it
+    orjson = None  # type: ignore  # noqa: WPS440
+
+JSON_MEDIA_TYPE = "application/json"
+ENCODED_LABELS_CACHE_SIZE = 256
+
+
+def json_loads(raw_json: bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(raw_json)
+
+    return json.loads(raw_json)
+
+
+def json_dumps(payload: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(payload)
+
+    # Same options as in `starlette.responses.JSONResponse`
+    return json.dumps(
+        payload,
+        ensure_ascii=False,
+        allow_nan=False,
+        indent=None,
+        separators=(",", ":"),
+    ).encode()
+
+
+async def read_json(request: Request) -> Any:
+    """Decode request body, raise `ValueError` if it isn't valid JSON."""
+    return json_loads(await request.body())
+
+
+class FastJSONResponse(Response):
+    media_type = JSON_MEDIA_TYPE
+
+    def render(self, payload: Any) -> bytes:
+        return json_dumps(payload)
+
+
+def encoded_response(encoded_payload: bytes, status_code: int) -> Response:
+    return Response(
+        encoded_payload, status_code=status_code, media_type=JSON_MEDIA_TYPE
+    )
+
+
+ENCODED_COMMAND_ACCEPTED = json_dumps(build_command_accepted_response())
+
+
+@lru_cache(maxsize=ENCODED_LABELS_CACHE_SIZE)
+def encode_bot_disabled(error_label: str) -> bytes:
+    return json_dumps(build_bot_disabled_response(error_label))
+
+
+@lru_cache(maxsize=ENCODED_LABELS_CACHE_SIZE)
+def encode_unverified_request(status_message: str) -> bytes:
+    return json_dumps(build_unverified_request_response(status_message=status_message))
+
+
+def command_accepted_response() -> Response:
+    return encoded_response(ENCODED_COMMAND_ACCEPTED, HTTPStatus.ACCEPTED)
+
+
+def bot_disabled_response(
+    error_label: str,
+    status_code: int = HTTPStatus.SERVICE_UNAVAILABLE,
+) -> Response:
+    return encoded_response(encode_bot_disabled(error_label), status_code)
@@ -0,0 +1,71 @@
+"""Draining of running handlers before server stops."""
+
+import asyncio
+import os
+import signal
+from typing import Optional
+
+from app.api.admission import AdmissionController
+from app.bot.bot_with_help import BotWithHelp
+from app.logger import logger
+
+
+def stop_server() -> None:
+    # Uvicorn handles SIGINT the same way as SIGTERM
+    os.kill(os.getpid(), signal.SIGINT)
+
+
+class ShutdownDrainer:
+    """Let running handlers finish instead of failing them on deploy.
+
+    Uvicorn closes its sockets before running shutdown hooks, so handlers
+    drained there can't receive BotX callbacks. That's why handlers are
+    drained on SIGTERM: new commands are rejected with 503, but callbacks are
+    still received. Server is stopped after draining, second SIGTERM stops it
+    at once.
+    """
+
+    def __init__(
+        self,
+        bot: BotWithHelp,
+        admission_controller: AdmissionController,
+        timeout: float,
+    ) -> None:
+        self._bot = bot
+        self._admission_controller = admission_controller
+        self._timeout = timeout
+        self._drain_task: Optional["asyncio.Task[None]"] = None
+
+    def install_signal_handler(self) -> None:
+        try:
+            asyncio.get_running_loop().add_signal_handler(
+                signal.SIGTERM, self._handle_sigterm
+            )
+        except (NotImplementedError, ValueError):
+            # Signals are handled only in main thread and not on Windows
+            logger.warning("Handlers will be drained only after server stop")
+
+    async def drain(self, *, is_serving: bool) -> None:
+        self._admission_controller.close()
+        if not is_serving:
+            # Callbacks can't be received anymore, don't wait for them
+            await self._bot.stop_callbacks_waiting()
+
+        cancelled_tasks_count = await self._bot.drain(self._timeout)
+        if cancelled_tasks_count:
+            logger.warning(
+                f"Cancelled {cancelled_tasks_count} handlers still running "
+                f"after {self._timeout}s"
+            )
+
+    def _handle_sigterm(self) -> None:
+        if self._drain_task is not None:
+            stop_server()
+            return
+
+        logger.info("Draining running handlers before shutdown")
+        self._drain_task = asyncio.create_task(self._drain_and_stop_server())
+
+    async def _drain_and_stop_server(self) -> None:
+        await self.drain(is_serving=True)
+        stop_server()
@@ -0,0 +1,88 @@
+"""In-memory pipe for streaming file from one BotX method to another."""
+
+import asyncio
+import os
+from collections import deque
+from typing import Deque, Optional
+
+from pybotx.async_buffer import AsyncBufferReadable, AsyncBufferWritable
+
+
+class AsyncPipe(AsyncBufferReadable, AsyncBufferWritable):  # noqa: WPS214
+    """Buffer with writer and reader working at the same time.
+
+    Writer waits while `max_size` bytes are unread, so memory usage doesn't
+    depend on file size. Reader gets available bytes without waiting for more
+    of them and empty bytes after `close_writing`. Seeking isn't supported,
+    it only returns current position.
+    """
+
+    def __init__(self, max_size: int) -> None:
+        self._max_size = max_size
+        self._chunks: Deque[bytes] = deque()
+        self._unread_size = 0
+        self._is_writing_closed = False
+        self._condition = asyncio.Condition()
+
+        self.written_size = 0
+
+    async def write(self, content: bytes) -> int:  # noqa: WPS110
+        async with self._condition:
+            await self._condition.wait_for(lambda: self._unread_size < self._max_size)
+            self._chunks.append(content)
+            self._unread_size += len(content)
+            self.written_size += len(content)
+            self._condition.notify_all()
+
+        return len(content)
+
+    async def read(self, bytes_to_read: Optional[int] = None) -> bytes:
+        async with self._condition:
+            await self._condition.wait_for(
+                lambda: bool(self._chunks) or self._is_writing_closed
+            )
+            chunks = self._pop_chunks(bytes_to_read)
+            self._condition.notify_all()
+
+        return chunks
+
+    async def wait_content(self) -> bool:
+        """Wait for bytes to read, `False` if writing closed without them."""
+        async with self._condition:
+            await self._condition.wait_for(
+                lambda: bool(self._chunks) or self._is_writing_closed
+            )
+
+        return bool(self._chunks)
+
+    async def close_writing(self) -> None:
+        async with self._condition:
+            self._is_writing_closed = True
+            self._condition.notify_all()
+
+    async def seek(self, cursor: int, whence: int = os.SEEK_SET) -> int:
+        # Called by `download_file` after writing
+        return await self.tell()
+
+    async def tell(self) -> int:
+        return self.written_size
+
+    def _pop_chunks(self, bytes_to_read: Optional[int]) -> bytes:
+        if bytes_to_read is None:
+            bytes_to_read = self._unread_size
+
+        chunks = []
+        chunks_size = 0
+        while self._chunks and chunks_size < bytes_to_read:
+            chunk = self._chunks.popleft()
+            if chunks_size + len(chunk) > bytes_to_read:
+                split_at = bytes_to_read - chunks_size
+                self._chunks.appendleft(chunk[split_at:])
+                chunk = chunk[:split_at]
+
+            chunks.append(chunk)
+            chunks_size += len(chunk)
+
+        self._unread_size -= chunks_size
+
+        return b"".join(chunks)
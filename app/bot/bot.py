@@ -1,49 +1,51 @@
 """Configuration for bot instance."""
 
 from app.bot.bot_with_help import BotWithHelp
-from app.bot.commands import (
-    administration,
-    botx_callback_method,
-    botx_method,
-    common,
-    credentials,
-    debug,
-    edit,
-    events,
-    files,
-    internal_bot_notification,
-    markup,
-    mentions,
-    search,
-    spam,
-    special_messages,
-    users_as_csv,
-)
+from app.bot.commands_loader import COMMAND_MODULE_NAMES, load_collectors
 from app.bot.error_handlers.internal_error import internal_error_handler
+from app.bot.http_client import build_httpx_client
 from app.bot.middlewares.answer_error_message import answer_error_middleware
-from app.bot.middlewares.debug_messages import debug_incoming_message_middleware
+from app.bot.middlewares.debug_messages import (
+    debug_incoming_message_middleware,
+    outgoing_requests_tap,
+)
+from app.bot.outbound_scheduler import OutboundScheduler
+from app.bot.state_store import state_store
 from app.settings import settings
 
 bot = BotWithHelp(
-    collectors=[
-        administration.collector,
-        botx_callback_method.collector,
-        botx_method.collector,
-        common.collector,
-        credentials.collector,
-        edit.collector,
-        events.collector,
-        files.collector,
-        markup.collector,
-        mentions.collector,
-        search.collector,
-        spam.collector,
-        special_messages.collector,
-        internal_bot_notification.collector,
-        debug.collector,
-        users_as_csv.collector,
-    ],
+    collectors=load_collectors(COMMAND_MODULE_NAMES, lazy=settings.LAZY_COMMANDS),
     bot_accounts=settings.BOT_CREDENTIALS,
+    httpx_client=build_httpx_client(
+        [bot_account.cts_url for bot_account in settings.BOT_CREDENTIALS],
+        max_connections=settings.HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY,
+        connect_timeout=settings.HTTP_CONNECT_TIMEOUT,
+        read_timeout=settings.HTTP_READ_TIMEOUT,
+        write_timeout=settings.HTTP_WRITE_TIMEOUT,
+        pool_timeout=settings.HTTP_POOL_TIMEOUT,
+        http2=settings.HTTP2,
+    ),
     exception_handlers={Exception: internal_error_handler},
     middlewares=[debug_incoming_message_middleware, answer_error_middleware],
+    status_cache_ttl=settings.STATUS_CACHE_TTL,
+    status_cache_max_size=settings.STATUS_CACHE_MAX_SIZE,
+    state_store=state_store,
+    callback_stats_size=settings.CALLBACK_STATS_SIZE,
+    dispatch_workers_count=settings.DISPATCH_WORKERS,
+    outbound_scheduler=(
+        OutboundScheduler(
+            bot_rate=settings.OUTBOUND_BOT_RATE,
+            bot_burst=settings.OUTBOUND_BOT_BURST,
+            chat_rate=settings.OUTBOUND_CHAT_RATE,
+            chat_burst=settings.OUTBOUND_CHAT_BURST,
+            queue_max_size=settings.OUTBOUND_QUEUE_SIZE,
+        )
+        if settings.OUTBOUND_BOT_RATE
+        else None
+    ),
 )
+
+bot.add_httpx_event_hook("request", outgoing_requests_tap.on_request)
+bot.add_httpx_event_hook("response", outgoing_requests_tap.on_response)
@@ -1,15 +1,211 @@
 """Bot subclass allowing to get command help."""
 
-from typing import List, Optional, Sequence
+import asyncio
+from functools import partial
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Literal,
+    Mapping,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+)
+from uuid import UUID
 
-from pybotx import Bot
+import httpx
+from pybotx import (
+    Bot,
+    BotAccountWithSecret,
+    BubbleMarkup,
+    KeyboardMarkup,
+    OutgoingAttachment,
+)
 from pybotx.bot.handler import Middleware
 from pybotx.bot.middlewares.exception_middleware import ExceptionHandlersDict
+from pybotx.missing import Missing, Undefined
+from pybotx.models.attachments import IncomingFileAttachment
+from pybotx.models.commands import BotCommand
 
+from app.bot.callback_stats import (
+    CallbackStats,
+    TimedCallbackRepo,
+    remember_botx_method,
+)
+from app.bot.datastructures import TTLCache
+from app.bot.dispatch_scheduler import DispatchScheduler, get_chat_key
 from app.bot.handler_with_help import HandlerCollectorWithHelp
+from app.bot.outbound_scheduler import OutboundScheduler
+from app.bot.shared_bot_accounts_storage import SharedBotAccountsStorage
+from app.bot.state_store import MemoryStateStore, StateStore
 
+HttpxEventHook = Callable[[Any], Awaitable[None]]
+
+# bot_id, chat_type and user_huid from status query
+StatusCacheKey = Tuple[Optional[str], Optional[str], Optional[str]]
+
+
+class BotWithHelp(Bot):  # noqa: WPS214
+    def __init__(
+        self,
+        *args: Any,
+        status_cache_ttl: float = 0,
+        status_cache_max_size: int = 0,
+        state_store: Optional[StateStore] = None,
+        callback_stats_size: int = 1000,
+        dispatch_workers_count: int = 0,
+        outbound_scheduler: Optional[OutboundScheduler] = None,
+        **kwargs: Any,
+    ) -> None:
+        self.callback_stats = CallbackStats(callback_stats_size)
+        kwargs.setdefault("callback_repo", TimedCallbackRepo(self.callback_stats))
+
+        super().__init__(*args, **kwargs)
+        self.add_httpx_event_hook("request", remember_botx_method)
+        self._shared_bot_accounts_storage = SharedBotAccountsStorage(
+            list(self._bot_accounts_storage.iter_bot_accounts()),
+            state_store or MemoryStateStore(),
+        )
+        self._bot_accounts_storage = self._shared_bot_accounts_storage
+        self._active_tasks: Set["asyncio.Task[None]"] = set()
+        self.dispatch_scheduler: Optional[DispatchScheduler] = None
+        if dispatch_workers_count:
+            self.dispatch_scheduler = DispatchScheduler(dispatch_workers_count)
+        self.outbound_scheduler = outbound_scheduler
+        self.status_cache: TTLCache[StatusCacheKey, Dict[str, Any]] = TTLCache(
+            status_cache_ttl, status_cache_max_size
+        )
+
+    def add_httpx_event_hook(
+        self, event_name: Literal["request", "response"], hook: HttpxEventHook
+    ) -> None:
+        self._httpx_client.event_hooks[event_name].append(hook)
+
+    @property
+    def httpx_client(self) -> httpx.AsyncClient:
+        return self._httpx_client
+
+    @property
+    def active_tasks_count(self) -> int:
+        return len(self._active_tasks)
+
+    def async_execute_bot_command(
+        self, bot_command: BotCommand
+    ) -> "asyncio.Task[None]":
+        if self.dispatch_scheduler is None:
+            task = super().async_execute_bot_command(bot_command)
+        else:
+            self._bot_accounts_storage.ensure_bot_id_exists(bot_command.bot.id)
+            task = asyncio.create_task(
+                self.dispatch_scheduler.run(
+                    get_chat_key(bot_command),
+                    self._handler_collector.handle_bot_command,
+                    bot_command,
+                    self,
+                )
+            )
+
+        self._active_tasks.add(task)
+        task.add_done_callback(self._active_tasks.discard)
+
+        return task
+
+    async def stop_callbacks_waiting(self) -> None:
+        """Fail handlers waiting for BotX callbacks instead of hanging them."""
+        await self._callbacks_manager.stop_callbacks_waiting()
+
+    async def drain(self, timeout: float) -> int:
+        """Wait for running handlers and cancel ones left after timeout.
+
+        Return count of cancelled handlers.
+        """
+        if not self._active_tasks:
+            return 0
+
+        _, pending_tasks = await asyncio.wait(self._active_tasks, timeout=timeout)
+        for task in pending_tasks:
+            task.cancel()
+
+        await asyncio.gather(*pending_tasks, return_exceptions=True)
+
+        return len(pending_tasks)
+
+    async def send_message(  # noqa: WPS211
+        self,
+        *,
+        bot_id: UUID,
+        chat_id: UUID,
+        body: str,
+        metadata: Missing[Dict[str, Any]] = Undefined,
+        bubbles: Missing[BubbleMarkup] = Undefined,
+        keyboard: Missing[KeyboardMarkup] = Undefined,
+        file: Missing[Union[IncomingFileAttachment, OutgoingAttachment]] = Undefined,
+        silent_response: Missing[bool] = Undefined,
+        markup_auto_adjust: Missing[bool] = Undefined,
+        recipients: Missing[List[UUID]] = Undefined,
+        stealth_mode: Missing[bool] = Undefined,
+        send_push: Missing[bool] = Undefined,
+        ignore_mute: Missing[bool] = Undefined,
+        wait_callback: bool = True,
+        callback_timeout: Optional[float] = None,
+    ) -> UUID:
+        # `answer_message` and `send` are sent through this method too
+        send = partial(
+            super().send_message,
+            bot_id=bot_id,
+            chat_id=chat_id,
+            body=body,
+            metadata=metadata,
+            bubbles=bubbles,
+            keyboard=keyboard,
+            file=file,
+            silent_response=silent_response,
+            markup_auto_adjust=markup_auto_adjust,
+            recipients=recipients,
+            stealth_mode=stealth_mode,
+            send_push=send_push,
+            ignore_mute=ignore_mute,
+            wait_callback=wait_callback,
+            callback_timeout=callback_timeout,
+        )
+        if self.outbound_scheduler is None:
+            return await send()
+
+        return await self.outbound_scheduler.run(bot_id, chat_id, send)
+
+    async def raw_get_status(
+        self,
+        query_params: Dict[str, str],
+        verify_request: bool = True,
+        request_headers: Optional[Mapping[str, str]] = None,
+        trusted_issuers: Optional[Set[str]] = None,
+    ) -> Dict[str, Any]:
+        if verify_request:
+            self._verify_request(request_headers, trusted_issuers=trusted_issuers)
+
+        cache_key = (
+            query_params.get("bot_id"),
+            query_params.get("chat_type"),
+            query_params.get("user_huid"),
+        )
+        if (cached_status := self.status_cache.get(cache_key)) is not None:
+            return cached_status
+
+        status = await super().raw_get_status(query_params, verify_request=False)
+        self.status_cache.set(cache_key, status)
+
+        return status
+
+    def add_bot_account(self, bot_account: BotAccountWithSecret) -> None:
+        # Normally bot accounts doesn't added on the fly
+        self._shared_bot_accounts_storage.add_bot_account(bot_account)
+        self.status_cache.clear()
 
-class BotWithHelp(Bot):
     def get_command_help(self, command: str) -> str:
         self._handler_collector: HandlerCollectorWithHelp
         try:
@@ -28,5 +224,7 @@ class BotWithHelp(Bot):
         main_collector = HandlerCollectorWithHelp(middlewares=middlewares)
         main_collector.insert_exception_middleware(exception_handlers)
         main_collector.include(*collectors)
+        main_collector.insert_handler_metrics_middlewares()
+        main_collector.build_routing_index()
 
         return main_collector
@@ -2,10 +2,11 @@ import json
 from typing import Any, Dict, Optional, Union, cast
 from uuid import UUID
 
-from aiofiles.tempfile import NamedTemporaryFile
 from pybotx import Bot, File
 from pybotx.models.attachments import IncomingFileAttachment, OutgoingAttachment
 
+from app.bot.spooled_buffer import SpooledAsyncBuffer
+
 BOTX_RESPONSE_LABEL_TEMPLATE = "**Status code:** `{status_code}`\n**Response payload:**"
 
 
@@ -24,7 +25,7 @@ async def send_json_snippet(
         await bot.send_message(bot_id=bot_id, chat_id=chat_id, body=text)
         return
 
-    async with NamedTemporaryFile("wb+") as async_buffer:
+    async with SpooledAsyncBuffer() as async_buffer:
         await async_buffer.write(snippet.encode())
         await async_buffer.seek(0)
 
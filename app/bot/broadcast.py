@@ -0,0 +1,57 @@
+"""Sending one message to many chats."""
+
+import asyncio
+from dataclasses import dataclass, field
+from time import monotonic
+from typing import Iterable, List
+from uuid import UUID
+
+from pybotx import Bot, BotIsNotChatMemberError, ChatNotFoundError
+
+from app.bot.outbound_scheduler import bulk_sends
+from app.logger import logger
+
+
+@dataclass
+class BroadcastResult:
+    sent_count: int = 0
+    failed_count: int = 0
+    # Chats which don't exist or where bot isn't a member anymore
+    unreachable_chat_ids: List[UUID] = field(default_factory=list)
+
+
+async def broadcast_message(
+    bot: Bot,
+    bot_id: UUID,
+    chat_ids: Iterable[UUID],
+    body: str,
+    max_concurrency: int,
+) -> BroadcastResult:
+    """Send message to chats with at most `max_concurrency` requests at once."""
+    started_at = monotonic()
+    semaphore = asyncio.Semaphore(max_concurrency)
+    broadcast_result = BroadcastResult()
+
+    async def send(chat_id: UUID) -> None:  # noqa: WPS430
+        async with semaphore:
+            try:
+                await bot.send_message(bot_id=bot_id, chat_id=chat_id, body=body)
+            except (ChatNotFoundError, BotIsNotChatMemberError):
+                broadcast_result.unreachable_chat_ids.append(chat_id)
+            except Exception:
+                broadcast_result.failed_count += 1
+                logger.exception(f"Can't broadcast message to {chat_id}")
+            else:
+                broadcast_result.sent_count += 1
+
+    with bulk_sends():
+        await asyncio.gather(*(send(chat_id) for chat_id in chat_ids))
+
+    logger.info(
+        f"Broadcast to {broadcast_result.sent_count} chats "
+        f"in {monotonic() - started_at:.3f}s, "
+        f"failed: {broadcast_result.failed_count}, "
+        f"unreachable: {len(broadcast_result.unreachable_chat_ids)}"
+    )
+
+    return broadcast_result
@@ -0,0 +1,128 @@
+"""Round-trip latency of BotX method callbacks."""
+
+import re
+from collections import OrderedDict, deque
+from contextvars import ContextVar
+from time import monotonic
+from typing import Deque, Dict, Optional, Tuple
+from uuid import UUID
+
+import httpx
+from pybotx.bot.callbacks.callback_memory_repo import CallbackMemoryRepo
+from pybotx.bot.exceptions import BotXMethodCallbackNotFoundError
+from pybotx.models.method_callbacks import BotXMethodCallback
+
+UNKNOWN_METHOD_LABEL = "<unknown>"
+PERCENTILES = (50, 95, 99)
+
+# Callbacks which are never received shouldn't be kept forever
+MAX_PENDING_CALLBACKS = 10000
+
+BOTX_PATH_PREFIX_REGEXP = re.compile(r"^/api/v\d+/botx/")
+
+# Method and time of sending request
+SentBotXMethod = Tuple[str, float]
+
+# Set from httpx request hook in the task calling BotX method, so callback
+# created after response could be attributed to this method and timed from
+# sending its request
+current_botx_method: ContextVar[Optional[SentBotXMethod]] = ContextVar(
+    "current_botx_method", default=None
+)
+
+
+async def remember_botx_method(request: httpx.Request) -> None:
+    current_botx_method.set(
+        (BOTX_PATH_PREFIX_REGEXP.sub("", request.url.path), monotonic())
+    )
+
+
+def get_percentile(sorted_latencies: Tuple[float, ...], percentile: int) -> float:
+    index = len(sorted_latencies) * percentile // 100
+    return sorted_latencies[min(index, len(sorted_latencies) - 1)]
+
+
+class CallbackStats:
+    """Recent callback latencies per method and late callbacks count."""
+
+    def __init__(self, latencies_max_size: int) -> None:
+        self._latencies_max_size = latencies_max_size
+        self._latencies: Dict[str, Deque[float]] = {}
+        self._pending: "OrderedDict[UUID, Tuple[str, float]]" = OrderedDict()
+
+        self.received_count = 0
+        self.late_count = 0
+
+    def add_pending(self, sync_id: UUID, method: str, sent_at: float) -> None:
+        self._pending[sync_id] = (method, sent_at)
+        if len(self._pending) > MAX_PENDING_CALLBACKS:
+            self._pending.popitem(last=False)
+
+    def add_received(self, sync_id: UUID) -> None:
+        self.received_count += 1
+        try:
+            method, sent_at = self._pending.pop(sync_id)
+        except KeyError:
+            return
+
+        latencies = self._latencies.get(method)
+        if latencies is None:
+            latencies = deque(maxlen=self._latencies_max_size)
+            self._latencies[method] = latencies
+
+        latencies.append(monotonic() - sent_at)
+
+    def add_late(self, sync_id: UUID) -> None:
+        """Count callback which nobody waits for (timed out or unknown)."""
+        self.late_count += 1
+        self._pending.pop(sync_id, None)
+
+    @property
+    def late_rate(self) -> float:
+        total_count = self.received_count + self.late_count
+        return self.late_count / total_count if total_count else 0
+
+    def get_percentiles(self) -> Dict[str, Dict[int, float]]:
+        """Get latency percentiles in seconds for each method."""
+        method_percentiles = {}
+        for method, latencies in self._latencies.items():
+            sorted_latencies = tuple(sorted(latencies))
+            method_percentiles[method] = {
+                percentile: get_percentile(sorted_latencies, percentile)
+                for percentile in PERCENTILES
+            }
+
+        return method_percentiles
+
+    def get_stats(self) -> Dict[str, float]:
+        return {
+            "received_callbacks": self.received_count,
+            "late_callbacks": self.late_count,
+            "pending_callbacks": len(self._pending),
+        }
+
+
+class TimedCallbackRepo(CallbackMemoryRepo):
+    def __init__(self, callback_stats: CallbackStats) -> None:
+        super().__init__()
+        self._callback_stats = callback_stats
+
+    async def create_botx_method_callback(self, sync_id: UUID) -> None:
+        await super().create_botx_method_callback(sync_id)
+        sent_botx_method = current_botx_method.get()
+        if sent_botx_method is None:
+            sent_botx_method = (UNKNOWN_METHOD_LABEL, monotonic())
+
+        self._callback_stats.add_pending(sync_id, *sent_botx_method)
+
+    async def set_botx_method_callback_result(
+        self,
+        callback: BotXMethodCallback,
+    ) -> None:
+        try:
+            await super().set_botx_method_callback_result(callback)
+        except BotXMethodCallbackNotFoundError:
+            self._callback_stats.add_late(callback.sync_id)
+            raise
+
+        self._callback_stats.add_received(callback.sync_id)
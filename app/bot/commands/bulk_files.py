@@ -0,0 +1,181 @@
+"""Handlers for uploading and downloading many files at once."""
+
+import asyncio
+from functools import partial
+from time import perf_counter
+from typing import List, Optional
+from uuid import UUID
+
+from pybotx import Bot, File, IncomingMessage
+
+from app.bot.async_pipe import AsyncPipe
+from app.bot.file_transfers import (
+    MEGABYTE,
+    TransferResult,
+    download_to_zip,
+    format_report,
+    run_transfers,
+    upload_attachment,
+)
+from app.bot.handler_with_help import HandlerCollectorWithHelp
+from app.bot.regular_expressions import (
+    DOWNLOAD_FILES_ARGS_REGEXP,
+    UPLOAD_FILES_ARGS_REGEXP,
+)
+from app.bot.zip_stream import ZipStreamWriter
+
+collector = HandlerCollectorWithHelp()
+
+DEFAULT_UPLOADS_COUNT = 10
+# Written and not yet uploaded part of archive kept in memory
+ARCHIVE_PIPE_MAX_SIZE = 4 * MEGABYTE
+
+
+@collector.command_with_help(
+    "/upload-files", description="Upload attachment to fileservice many times"
+)
+async def upload_files(message: IncomingMessage, bot: Bot) -> None:
+    """`/upload-files [copies] [concurrency=N]`
+
+    Upload attachment to fileservice many times concurrently and show time
+    of each upload and total throughput.
+
+    • `attachment` - Message attachment.
+    • `copies` - Number of uploads (default 10).
+    • `concurrency` - Maximum number of uploads at once.
+
+    ```bash
+    # Upload attachment 100 times, 20 at once
+    /upload-files 100 concurrency=20
+    <attachment>
+    ```
+    """
+    if not (attached_file := message.file):
+        await bot.answer_message("**Error:** Attached file is required")
+        return
+
+    if not (match := UPLOAD_FILES_ARGS_REGEXP.search(message.argument)):
+        await bot.answer_message("**Error:** Invalid arguments")
+        return
+
+    raw_copies = match.group("copies")
+    copies = int(raw_copies) if raw_copies else DEFAULT_UPLOADS_COUNT
+
+    started_at = perf_counter()
+    transfer_results = await run_transfers(
+        partial(upload_attachment, bot, message.bot.id, message.chat.id, attached_file),
+        range(copies),
+        parse_concurrency(match.group("concurrency")),
+    )
+
+    await bot.answer_message(
+        format_report(transfer_results, perf_counter() - started_at)
+    )
+
+
+@collector.command_with_help(
+    "/download-files", description="Download files from fileservice as zip"
+)
+async def download_files(message: IncomingMessage, bot: Bot) -> None:
+    """`/download-files file_id... [concurrency=N]`
+
+    Download files from fileservice concurrently, pack them into zip archive
+    and upload it back to fileservice. Time of each download, total
+    throughput and archive id are shown.
+
+    Archive is made on the fly while it is uploaded, so it isn't kept in
+    memory. It isn't uploaded if no file was downloaded, repeated ids are
+    downloaded once.
+
+    • `file_id` - Attachment id on fileservice (from `/upload-file` command).
+    • `concurrency` - Maximum number of downloads at once.
+
+    ```bash
+    /download-files 123e4567-e89b-12d3-a456-426655440000 \
+        223e4567-e89b-12d3-a456-426655440000 concurrency=2
+    ```
+    """
+    if not (match := DOWNLOAD_FILES_ARGS_REGEXP.search(message.argument)):
+        await bot.answer_message("**Error:** Invalid arguments")
+        return
+
+    try:
+        # Archive can't contain same name twice
+        file_ids = list(
+            dict.fromkeys(
+                UUID(raw_file_id) for raw_file_id in match.group("file_ids").split()
+            )
+        )
+    except ValueError:
+        await bot.answer_message("**Error:** File id is invalid")
+        return
+
+    pipe = AsyncPipe(ARCHIVE_PIPE_MAX_SIZE)
+    started_at = perf_counter()
+    transfer_tasks = (
+        asyncio.create_task(
+            download_all_to_zip(
+                message, bot, pipe, file_ids, match.group("concurrency")
+            )
+        ),
+        asyncio.create_task(upload_archive(message, bot, pipe)),
+    )
+    try:
+        transfer_results, archive = await asyncio.gather(*transfer_tasks)
+    finally:
+        # Other side of pipe would wait forever if one of them failed
+        for transfer_task in transfer_tasks:
+            transfer_task.cancel()
+        await asyncio.gather(*transfer_tasks, return_exceptions=True)
+
+    report = format_report(transfer_results, perf_counter() - started_at)
+    if archive is None:
+        await bot.answer_message(f"{report}\n**Error:** No file was downloaded")
+        return
+
+    await bot.answer_message(
+        f"{report}\n**Archive:** `{archive._file_id}`"  # noqa: WPS437
+    )
+
+
+async def download_all_to_zip(
+    message: IncomingMessage,
+    bot: Bot,
+    pipe: AsyncPipe,
+    file_ids: List[UUID],
+    raw_concurrency: Optional[str],
+) -> List[TransferResult]:
+    zip_writer = ZipStreamWriter(pipe)
+    try:  # noqa: WPS229, WPS501
+        transfer_results = await run_transfers(
+            partial(download_to_zip, bot, message.bot.id, message.chat.id, zip_writer),
+            file_ids,
+            parse_concurrency(raw_concurrency),
+        )
+        # Empty archive isn't written, so it isn't uploaded
+        if any(not transfer_result.error for transfer_result in transfer_results):
+            await zip_writer.close()
+    finally:
+        # Upload would wait for rest of archive forever
+        await pipe.close_writing()
+
+    return transfer_results
+
+
+async def upload_archive(
+    message: IncomingMessage, bot: Bot, pipe: AsyncPipe
+) -> Optional[File]:
+    # Upload starts only when first downloaded file is added to archive
+    if not await pipe.wait_content():
+        return None
+
+    return await bot.upload_file(
+        bot_id=message.bot.id,
+        chat_id=message.chat.id,
+        filename="files.zip",
+        async_buffer=pipe,
+    )
+
+
+def parse_concurrency(raw_concurrency: Optional[str]) -> Optional[int]:
+    return int(raw_concurrency) if raw_concurrency else None
@@ -1,7 +1,9 @@
 """Handlers for default bot commands and system events."""
 
 import json
+from functools import lru_cache
 from os import environ
+from typing import Tuple
 
 from pybotx import Bot, IncomingMessage, StatusRecipient
 
@@ -11,6 +13,18 @@ from app.resources import strings
 
 collector = HandlerCollectorWithHelp()
 
+HELP_MESSAGES_CACHE_SIZE = 64
+
+# Sorted pairs of visible commands and their descriptions
+StatusSignature = Tuple[Tuple[str, str], ...]
+
+
+@lru_cache(maxsize=HELP_MESSAGES_CACHE_SIZE)
+def render_help_message(status_signature: StatusSignature) -> str:
+    return strings.HELP_COMMAND_MESSAGE_TEMPLATE.format(
+        bot_status=dict(status_signature)
+    )
+
 
 @collector.default_message_handler
 async def default_handler(_: IncomingMessage, bot: Bot) -> None:
@@ -60,7 +74,7 @@ async def help_handler(message: IncomingMessage, bot: BotWithHelp) -> None:
         else:
             answer_body = f"**Error:** Command `{command_name}` doesn't exist"
     else:
-        answer_body = strings.HELP_COMMAND_MESSAGE_TEMPLATE.format(bot_status=status)
+        answer_body = render_help_message(tuple(sorted(status.items())))
 
     await bot.answer_message(answer_body)
 
@@ -1,20 +1,24 @@
 from uuid import UUID
 
-from pybotx import Bot, BotAccountWithSecret, IncomingMessage
+from pybotx import BotAccountWithSecret, IncomingMessage
 from pydantic import AnyHttpUrl
 
+from app.bot.bot_with_help import BotWithHelp
 from app.bot.handler_with_help import HandlerCollectorWithHelp
 from app.bot.regular_expressions import ADD_BOT_CREDENIALS_REGEXP
 
 collector = HandlerCollectorWithHelp()
 
 
-@collector.command_with_help("/add-credentials", description="Add new bot credentials")
-async def add_credentials_handler(message: IncomingMessage, bot: Bot) -> None:
+@collector.command_with_help(  # type: ignore
+    "/add-credentials", description="Add new bot credentials"
+)
+async def add_credentials_handler(message: IncomingMessage, bot: BotWithHelp) -> None:
     """`/add-credentials host secret_key bot_id`
 
-    Add new bot credentials. They will be available until bot restart.
-    For persistent credentials use `BOT_CREDENTIALS` env variable.
+    Add new bot credentials or replace secret of added ones. They will be
+    available until bot restart, unless `STATE_STORE_PATH` is set. For
+    persistent credentials use `BOT_CREDENTIALS` env variable.
 
     • `host` - Bot host (same as admin-site host).
     • `secret` - Secret key from bot profile.
@@ -43,8 +47,7 @@ async def add_credentials_handler(message: IncomingMessage, bot: Bot) -> None:
     if "://" not in host:
         host = f"https://{host}"
 
-    # Normally bot accounts doesn't added on the fly
-    bot._bot_accounts_storage._bot_accounts.append(  # noqa: WPS437
+    bot.add_bot_account(
         BotAccountWithSecret(
             id=bot_id, cts_url=AnyHttpUrl(host, scheme="https"), secret_key=secret_key
         )
@@ -18,6 +18,7 @@ async def debug_toggle(message: IncomingMessage, bot: Bot) -> None:
 
     Toggle debug mode for a specific chat. All incoming and outgoing requests
     from there will be sent to the chat where this command was sent.
+    Outgoing requests are sent as a digest with timings every few seconds.
 
     • `##chat` - mention of target chat or `self` for personal chat with bot.
 
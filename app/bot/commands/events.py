@@ -1,5 +1,8 @@
 """Handlers for system events."""
 
+from contextlib import suppress
+from typing import Union
+
 from pybotx import (
     AddedToChatEvent,
     Bot,
@@ -12,7 +15,9 @@ from pybotx import (
     MentionBuilder,
 )
 
+from app.bot.broadcast import broadcast_message
 from app.bot.handler_with_help import HandlerCollectorWithHelp
+from app.settings import settings
 
 collector = HandlerCollectorWithHelp()
 
@@ -57,22 +62,34 @@ async def disable_cts_events(message: IncomingMessage, bot: Bot) -> None:
     await bot.answer_message("CTS events are disabled.")
 
 
+async def notify_cts_event_listeners(
+    event: Union[CTSLoginEvent, CTSLogoutEvent], bot: Bot, text: str
+) -> None:
+    host = event.bot.host
+    listeners = bot.state.chats_listening_cts_events
+    broadcast_result = await broadcast_message(
+        bot,
+        event.bot.id,
+        listeners.get(host),
+        text,
+        settings.CTS_EVENTS_BROADCAST_CONCURRENCY,
+    )
+
+    for chat_id in broadcast_result.unreachable_chat_ids:
+        with suppress(KeyError):
+            listeners.remove(host, chat_id)
+
+
 @collector.cts_login
 async def cts_login_handler(event: CTSLoginEvent, bot: Bot) -> None:
-    listeners = bot.state.chats_listening_cts_events.get(event.bot.host)
-
-    for chat_id in listeners:
-        text = f"{MentionBuilder.contact(event.huid)} logged into {event.bot.host}"
-        await bot.send_message(bot_id=event.bot.id, chat_id=chat_id, body=text)
+    text = f"{MentionBuilder.contact(event.huid)} logged into {event.bot.host}"
+    await notify_cts_event_listeners(event, bot, text)
 
 
 @collector.cts_logout
 async def cts_logout_handler(event: CTSLogoutEvent, bot: Bot) -> None:
-    listeners = bot.state.chats_listening_cts_events.get(event.bot.host)
-
-    for chat_id in listeners:
-        text = f"{MentionBuilder.contact(event.huid)} logged out from {event.bot.host}"
-        await bot.send_message(bot_id=event.bot.id, chat_id=chat_id, body=text)
+    text = f"{MentionBuilder.contact(event.huid)} logged out from {event.bot.host}"
+    await notify_cts_event_listeners(event, bot, text)
 
 
 @collector.chat_created
@@ -1,23 +1,30 @@
 """Handlers for repeating incoming messages."""
 
+import asyncio
+from time import perf_counter
 from uuid import UUID
 
-import aiofiles
-from aiofiles.tempfile import NamedTemporaryFile
 from pybotx import (
     Bot,
     ChatNotFoundError,
+    File,
     FileDeletedError,
     FileMetadataNotFound,
     IncomingMessage,
     OutgoingAttachment,
 )
 
-from app.bot.file_utils import get_file_paths
+from app.bot.async_pipe import AsyncPipe
+from app.bot.file_utils import sample_files
 from app.bot.handler_with_help import HandlerCollectorWithHelp
+from app.bot.spooled_buffer import SpooledAsyncBuffer
 
 collector = HandlerCollectorWithHelp()
 
+MEGABYTE = 1024 * 1024
+# Downloaded and not yet uploaded part of async file kept in memory
+ECHO_PIPE_MAX_SIZE = 4 * MEGABYTE
+
 
 @collector.command_with_help(
     "/echo-file", description="Send received attachment back to user"
@@ -27,6 +34,9 @@ async def echo_file_handler(message: IncomingMessage, bot: Bot) -> None:
 
     Sends received attachment back to user.
 
+    Async file is streamed from fileservice back to fileservice without
+    keeping it in memory, id of uploaded file and transfer speed are sent.
+
     • `attachment` - Message attachment.
 
     Examples:
@@ -41,12 +51,57 @@ async def echo_file_handler(message: IncomingMessage, bot: Bot) -> None:
         return
 
     if attached_file.is_async_file:
-        await bot.answer_message("**Error:** Async-files are not supported")
+        await echo_async_file(message, bot, attached_file)
         return
 
     await bot.answer_message("", file=attached_file)
 
 
+async def echo_async_file(message: IncomingMessage, bot: Bot, async_file: File) -> None:
+    pipe = AsyncPipe(ECHO_PIPE_MAX_SIZE)
+
+    async def download() -> None:  # noqa: WPS430
+        try:  # noqa: WPS501
+            await bot.download_file(
+                bot_id=message.bot.id,
+                chat_id=message.chat.id,
+                file_id=async_file._file_id,  # noqa: WPS437
+                async_buffer=pipe,
+            )
+        finally:
+            await pipe.close_writing()
+
+    started_at = perf_counter()
+    transfer_tasks = (
+        asyncio.create_task(download()),
+        asyncio.create_task(
+            bot.upload_file(
+                bot_id=message.bot.id,
+                chat_id=message.chat.id,
+                filename=async_file.filename,
+                async_buffer=pipe,
+            )
+        ),
+    )
+    try:
+        _, uploaded_file = await asyncio.gather(*transfer_tasks)
+    except (FileMetadataNotFound, ChatNotFoundError, FileDeletedError) as error:
+        await bot.answer_message(str(error))
+        return
+    finally:
+        # Other side of pipe would wait forever if one of them failed
+        for transfer_task in transfer_tasks:
+            transfer_task.cancel()
+        await asyncio.gather(*transfer_tasks, return_exceptions=True)
+
+    elapsed = perf_counter() - started_at
+    await bot.answer_message(
+        f"File_id: `{uploaded_file._file_id}`\n"  # noqa: WPS437
+        f"Transferred {pipe.written_size / MEGABYTE:.2f} MB "
+        f"in {elapsed:.2f}s ({pipe.written_size / MEGABYTE / elapsed:.2f} MB/s)"
+    )
+
+
 @collector.command_with_help("/upload-file", description="Upload file to fileservice")
 async def upload_file(message: IncomingMessage, bot: Bot) -> None:
     """`/upload-file attachment`
@@ -109,7 +164,7 @@ async def download_file(message: IncomingMessage, bot: Bot) -> None:
         await bot.answer_message("**Error:** File id is invalid")
         return
 
-    async with NamedTemporaryFile("wb+") as async_buffer:
+    async with SpooledAsyncBuffer() as async_buffer:
         try:
             await bot.download_file(
                 bot_id=message.bot.id,
@@ -146,8 +201,7 @@ async def send_file(message: IncomingMessage, bot: Bot) -> None:
     """
 
     extension = message.argument
-    file_paths = await get_file_paths()
-    available_extensions = set(file_paths)
+    available_extensions = set(sample_files.get_file_paths())
 
     if not extension:
         await bot.answer_message(
@@ -156,15 +210,11 @@ async def send_file(message: IncomingMessage, bot: Bot) -> None:
         )
         return
 
-    if not (current_path := file_paths.get(extension)):
+    if not (outgoing_file := await sample_files.get_attachment(extension)):
         await bot.answer_message(
             f"Unknown extension: {extension}\n"
             f"Supported extensions: {available_extensions}"
         )
         return
 
-    async with aiofiles.open(current_path, "rb") as buffer:
-        outgoing_file = await OutgoingAttachment.from_async_buffer(
-            buffer, f"file.{extension}"
-        )
     await bot.answer_message("File", file=outgoing_file)
@@ -1,31 +1,143 @@
 """Sending multiple messages."""
 
 import asyncio
-from typing import Any, Awaitable
+from collections import Counter
+from dataclasses import dataclass, field
+from time import perf_counter
+from typing import Counter as CounterType, List, Set
 
 from pybotx import Bot, IncomingMessage
 
+from app.bot.callback_stats import PERCENTILES, get_percentile
 from app.bot.handler_with_help import HandlerCollectorWithHelp
+from app.bot.outbound_scheduler import bulk_sends
 from app.bot.regular_expressions import SPAM_ARGS_REGEXP
 
 collector = HandlerCollectorWithHelp()
 
+# Messages sent at once if concurrency isn't specified
+DEFAULT_SPAM_CONCURRENCY = 100
 
-async def delay_start(coro: Awaitable[Any], delay: float) -> Any:
-    await asyncio.sleep(delay)
-    return await coro
+
+def format_milliseconds(seconds: float) -> str:
+    return f"{seconds * 1000:.1f}ms"
+
+
+@dataclass
+class SpamReport:
+    latencies: List[float] = field(default_factory=list)
+    errors: CounterType[str] = field(default_factory=Counter)
+    elapsed: float = 0
+
+    @property
+    def throughput(self) -> float:
+        return len(self.latencies) / self.elapsed if self.elapsed else 0
+
+    def format(self, quantity: int, wait_callback: bool) -> str:
+        rows = [
+            f"**Sent:** {len(self.latencies)}/{quantity}",
+            f"**Elapsed:** {self.elapsed:.2f}s",
+            f"**Throughput:** {self.throughput:.1f} msg/s",
+        ]
+
+        if self.latencies:
+            latency_label = "callback" if wait_callback else "accepted by BotX"
+            rows.append(
+                f"**Latency until {latency_label}:** {self._format_latencies()}"
+            )
+
+        if self.errors:
+            rows.append("**Errors:**")
+            rows.extend(
+                f"• `{error_name}`: {count}"
+                for error_name, count in self.errors.most_common()
+            )
+
+        return "\n".join(rows)
+
+    def _format_latencies(self) -> str:
+        sorted_latencies = tuple(sorted(self.latencies))
+        percentiles = [
+            (f"p{percentile}", get_percentile(sorted_latencies, percentile))
+            for percentile in PERCENTILES
+        ]
+        percentiles.append(("max", sorted_latencies[-1]))
+
+        return ", ".join(
+            f"{label}={format_milliseconds(latency)}" for label, latency in percentiles
+        )
+
+
+async def send_spam_message(
+    bot: Bot,
+    body: str,
+    wait_callback: bool,
+    semaphore: asyncio.Semaphore,
+    report: SpamReport,
+) -> None:
+    started_at = perf_counter()
+    try:
+        await bot.answer_message(body, wait_callback=wait_callback)
+    except Exception as exc:
+        report.errors[type(exc).__name__] += 1
+    else:
+        report.latencies.append(perf_counter() - started_at)
+    finally:
+        semaphore.release()
+
+
+async def run_spam(
+    bot: Bot, quantity: int, interval: float, concurrency: int, wait_callback: bool
+) -> SpamReport:
+    """Send messages starting them every `interval` seconds.
+
+    Tasks are created one by one when there is a free slot, so only
+    `concurrency` messages are kept in memory.
+    """
+    report = SpamReport()
+    semaphore = asyncio.Semaphore(concurrency)
+    tasks: Set["asyncio.Task[None]"] = set()
+    started_at = perf_counter()
+
+    # Replies to other commands shouldn't wait for spam
+    with bulk_sends():
+        for message_number in range(quantity):
+            if interval:
+                start_at = started_at + message_number * interval
+                await asyncio.sleep(max(0, start_at - perf_counter()))
+
+            await semaphore.acquire()
+            task = asyncio.create_task(
+                send_spam_message(
+                    bot, f"Spam {message_number}", wait_callback, semaphore, report
+                )
+            )
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+
+        await asyncio.gather(*tasks)
+
+    report.elapsed = perf_counter() - started_at
+
+    return report
 
 
 @collector.command_with_help(
     "/spam", description="Send multiple messages with optional delay"
 )
 async def send_spam(message: IncomingMessage, bot: Bot) -> None:
-    """`/spam quantity [delay]`
+    """`/spam quantity [delay] [rate=N] [concurrency=N] [no_callback]`
 
-    Send multiple messages with optional delay.
+    Send multiple messages and report achieved throughput, latencies and errors.
 
     • `quantity` - Number of messages to send.
-    • `delay` - Delay between messages sending.
+    • `delay` - Delay in seconds between messages sending.
+    • `rate` - Messages per second, overrides delay.
+    • `concurrency` - Maximum number of messages sent at once (default 100).
+    • `no_callback` - Don't wait for BotX callbacks, latency is measured until
+    message is accepted by BotX.
+
+    Throughput is also limited by outgoing messages rate limits of the bot.
 
     Examples:
 
@@ -35,6 +147,12 @@ async def send_spam(message: IncomingMessage, bot: Bot) -> None:
 
     # Send 3 messages with 1 second delay
     /spam 3 1
+
+    # Send 1000 messages at 50 messages per second
+    /spam 1000 rate=50
+
+    # Send 10000 messages, at most 20 at once, without waiting callbacks
+    /spam 10000 concurrency=20 no_callback
     ```
     """
 
@@ -43,14 +161,19 @@ async def send_spam(message: IncomingMessage, bot: Bot) -> None:
         return
 
     quantity = int(match.group("quantity"))
-    delay = int(raw_delay) if (raw_delay := match.group("delay")) else 0
+    if raw_rate := match.group("rate"):
+        if not float(raw_rate):
+            await bot.answer_message("**Error:** Rate should be positive")
+            return
 
-    tasks = [
-        delay_start(
-            bot.answer_message(f"Spam {task_number}"),
-            delay * task_number,
-        )
-        for task_number in range(quantity)
-    ]
+        interval = 1 / float(raw_rate)
+    else:
+        interval = int(raw_delay) if (raw_delay := match.group("delay")) else 0
+
+    raw_concurrency = match.group("concurrency")
+    concurrency = int(raw_concurrency) if raw_concurrency else DEFAULT_SPAM_CONCURRENCY
+    wait_callback = not match.group("no_callback")
+
+    report = await run_spam(bot, quantity, interval, concurrency, wait_callback)
 
-    await asyncio.gather(*tasks)
+    await bot.answer_message(report.format(quantity, wait_callback))
@@ -0,0 +1,68 @@
+"""Handlers for bot runtime statistics."""
+
+from pybotx import IncomingMessage
+
+from app.bot.bot_with_help import BotWithHelp
+from app.bot.callback_stats import PERCENTILES
+from app.bot.handler_with_help import HandlerCollectorWithHelp
+from app.bot.http_client import get_pool_stats
+
+collector = HandlerCollectorWithHelp()
+
+
+@collector.command_with_help(  # type: ignore
+    "/callback-stats", description="Show BotX callbacks latency"
+)
+async def callback_stats_handler(_: IncomingMessage, bot: BotWithHelp) -> None:
+    """`/callback-stats`
+
+    Show percentiles of time between BotX method call and its callback arrival
+    for each method and rate of callbacks which arrived after timeout.
+
+    This command doesn't accept arguments.
+    """
+    callback_stats = bot.callback_stats
+
+    rows = [
+        "{0:<30}{1}".format(
+            "method",
+            "".join(f"{f'p{percentile}':>10}" for percentile in PERCENTILES),
+        )
+    ]
+    for method, percentiles in sorted(callback_stats.get_percentiles().items()):
+        latencies = "".join(
+            f"{percentiles[percentile] * 1000:>8.1f}ms" for percentile in PERCENTILES
+        )
+        rows.append(f"{method:<30}{latencies}")
+
+    table = "\n".join(rows)
+    text = (
+        f"```\n{table}\n```\n"
+        f"Received: {callback_stats.received_count}, "
+        f"late or unknown: {callback_stats.late_count} "
+        f"({callback_stats.late_rate:.2%})"
+    )
+
+    await bot.answer_message(text)
+
+
+@collector.command_with_help(  # type: ignore
+    "/pool-stats", description="Show BotX HTTP connections"
+)
+async def pool_stats_handler(_: IncomingMessage, bot: BotWithHelp) -> None:
+    """`/pool-stats`
+
+    Show open, active and idle HTTP connections to BotX for each CTS host.
+
+    This command doesn't accept arguments.
+    """
+    rows = ["{0:<40}{1:>8}{2:>8}{3:>8}".format("host", "open", "active", "idle")]
+    for host, host_stats in sorted(get_pool_stats(bot.httpx_client).items()):
+        rows.append(
+            "{0:<40}{1:>8}{2:>8}{3:>8}".format(
+                host, host_stats["open"], host_stats["active"], host_stats["idle"]
+            )
+        )
+
+    table = "\n".join(rows)
+    await bot.answer_message(f"```\n{table}\n```")
@@ -0,0 +1,173 @@
+"""Loading of command modules, eagerly or on first command use.
+
+In lazy mode commands are registered from manifest, and their module is
+imported only when one of its commands is called or its visibility function
+is needed for help. Modules with default or system event handlers are always
+imported.
+"""
+
+import json
+from functools import lru_cache
+from importlib import import_module
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+from pybotx import Bot, IncomingMessage, StatusRecipient
+from pybotx.bot.handler import CommandHandler, IncomingMessageHandlerFunc, VisibleFunc
+
+from app.bot.handler_with_help import HandlerCollectorWithHelp
+from app.logger import logger
+
+COMMANDS_PACKAGE = "app.bot.commands"
+COMMAND_MODULE_NAMES = (
+    "administration",
+    "botx_callback_method",
+    "botx_method",
+    "common",
+    "credentials",
+    "edit",
+    "events",
+    "files",
+    "bulk_files",
+    "markup",
+    "mentions",
+    "search",
+    "spam",
+    "special_messages",
+    "stats",
+    "internal_bot_notification",
+    "debug",
+    "users_as_csv",
+)
+MANIFEST_PATH = Path(__file__).parent / "commands_manifest.json"
+UNKNOWN_COMMAND_ANSWER = "Use `/help` to get available commands."
+# Command visibility is checked by function from its module
+VISIBLE_FUNC_MARKER = "function"
+
+
+def import_collector(module_name: str) -> HandlerCollectorWithHelp:
+    module = import_module(f"{COMMANDS_PACKAGE}.{module_name}")
+    return module.collector  # type: ignore[no-any-return]
+
+
+@lru_cache(maxsize=None)
+def get_command_handler(
+    module_name: str, command_name: str
+) -> Optional[CommandHandler]:
+    """Get command handler, `None` if it isn't in module from manifest."""
+    try:
+        collector = import_collector(module_name)
+    except ImportError:
+        logger.exception(f"Can't import commands module `{module_name}`")
+        return None
+
+    return dict(collector.iter_commands()).get(command_name)
+
+
+def build_lazy_handler(
+    module_name: str, command_name: str
+) -> IncomingMessageHandlerFunc:
+    async def lazy_handler(message: IncomingMessage, bot: Bot) -> None:  # noqa: WPS430
+        # Command handler has its own middlewares and is called with them
+        command_handler = get_command_handler(module_name, command_name)
+        if command_handler is None:
+            logger.error(
+                f"Command `{command_name}` isn't found in `{module_name}`, "
+                "commands manifest is outdated"
+            )
+            await bot.answer_message(UNKNOWN_COMMAND_ANSWER)
+            return
+
+        await command_handler(message, bot)
+
+    return lazy_handler
+
+
+def build_lazy_visible(module_name: str, command_name: str) -> VisibleFunc:
+    async def lazy_visible(  # noqa: WPS430
+        status_recipient: StatusRecipient, bot: Bot
+    ) -> bool:
+        command_handler = get_command_handler(module_name, command_name)
+        if command_handler is None:
+            return False
+
+        if callable(command_handler.visible):
+            return await command_handler.visible(status_recipient, bot)
+
+        return command_handler.visible
+
+    return lazy_visible
+
+
+def get_manifest_visibility(command_handler: CommandHandler) -> Union[bool, str]:
+    if callable(command_handler.visible):
+        return VISIBLE_FUNC_MARKER
+
+    return command_handler.visible
+
+
+def build_manifest(module_names: Sequence[str]) -> Dict[str, Any]:
+    """Collect commands info from modules, which can be loaded lazily."""
+    eager_modules = []
+    commands = []
+
+    for module_name in module_names:
+        collector = import_collector(module_name)
+        if collector.has_non_command_handlers:
+            eager_modules.append(module_name)
+            continue
+
+        for command_name, command_handler in collector.iter_commands():
+            commands.append(
+                {
+                    "module": module_name,
+                    "command": command_name,
+                    "description": getattr(command_handler, "description", None),
+                    "visible": get_manifest_visibility(command_handler),
+                    "help": collector.find_command_help(command_name),
+                }
+            )
+
+    return {"eager_modules": eager_modules, "commands": commands}
+
+
+def load_manifest() -> Dict[str, Any]:
+    with MANIFEST_PATH.open() as manifest_file:
+        return json.load(manifest_file)  # type: ignore[no-any-return]
+
+
+def build_lazy_collector(manifest: Dict[str, Any]) -> HandlerCollectorWithHelp:
+    collector = HandlerCollectorWithHelp()
+
+    for command_info in manifest["commands"]:
+        module_name = command_info["module"]
+        command_name = command_info["command"]
+        visible = command_info["visible"]
+        if visible == VISIBLE_FUNC_MARKER:
+            visible = build_lazy_visible(module_name, command_name)
+
+        collector.command(
+            command_name,
+            visible=visible,
+            description=command_info["description"],
+        )(build_lazy_handler(module_name, command_name))
+
+        if command_info["help"] is not None:
+            collector.add_command_help(command_name, command_info["help"])
+
+    return collector
+
+
+def load_collectors(
+    module_names: Sequence[str], lazy: bool
+) -> List[HandlerCollectorWithHelp]:
+    if not lazy:
+        return [import_collector(module_name) for module_name in module_names]
+
+    manifest = load_manifest()
+    collectors = [
+        import_collector(module_name) for module_name in manifest["eager_modules"]
+    ]
+    collectors.append(build_lazy_collector(manifest))
+
+    return collectors
@@ -1,44 +1,103 @@
 """Datastructures to help testing."""
 
-from collections import defaultdict
-from typing import Dict, Set
+from collections import OrderedDict
+from time import monotonic
+from typing import Dict, Generic, Hashable, Optional, Set, Tuple, TypeVar
 from uuid import UUID
 
+from app.bot.state_store import StateStore
+
+TKey = TypeVar("TKey", bound=Hashable)
+TValue = TypeVar("TValue")
+
 
 class CTSEventsListeners:
-    def __init__(self) -> None:
-        self._chats: Dict[str, Set[UUID]] = {}
+    namespace = "cts_events_listeners"
+
+    def __init__(self, store: StateStore) -> None:
+        self._store = store
 
     def add(self, host: str, chat_id: UUID) -> None:
-        self._chats.setdefault(host, set()).add(chat_id)
+        self._store.add(self.namespace, host, str(chat_id))
 
     def remove(self, host: str, chat_id: UUID) -> None:
-        self._chats[host].remove(chat_id)
+        if not self._store.remove(self.namespace, host, str(chat_id)):
+            raise KeyError(chat_id)
 
     def get(self, host: str) -> Set[UUID]:
-        return self._chats.get(host, set())
+        return {
+            UUID(chat_id) for chat_id in self._store.get_members(self.namespace, host)
+        }
 
 
 class DebugSubscribers:
-    def __init__(self) -> None:
-        self._subscribers: Dict[UUID, Set[UUID]] = defaultdict(set)
+    namespace = "debug_subscribers"
+
+    def __init__(self, store: StateStore) -> None:
+        self._store = store
 
     def add(self, subscriber_id: UUID, chat_id: UUID) -> None:
-        self._subscribers[chat_id].add(subscriber_id)
+        self._store.add(self.namespace, str(chat_id), str(subscriber_id))
 
     def remove(self, subscriber_id: UUID, chat_id: UUID) -> None:
-        self._subscribers[chat_id].discard(subscriber_id)
+        self._store.remove(self.namespace, str(chat_id), str(subscriber_id))
 
     def get(self, chat_id: UUID) -> Set[UUID]:
-        if chat_id not in self._subscribers:
-            return set()
+        return {
+            UUID(subscriber_id)
+            for subscriber_id in self._store.get_members(self.namespace, str(chat_id))
+        }
 
-        return self._subscribers[chat_id].copy()
+    def has_subscribers(self, chat_id: UUID) -> bool:
+        return self._store.has_members(self.namespace, str(chat_id))
 
     def toggle(self, subscriber_id: UUID, chat_id: UUID) -> bool:
-        if subscriber_id in self.get(chat_id):
-            self.remove(subscriber_id, chat_id)
+        if self._store.remove(self.namespace, str(chat_id), str(subscriber_id)):
             return False
 
         self.add(subscriber_id, chat_id)
         return True
+
+
+class TTLCache(Generic[TKey, TValue]):
+    """LRU cache with expiring entries. Zero `ttl` disables caching."""
+
+    def __init__(self, ttl: float, max_size: int) -> None:
+        self._ttl = ttl
+        self._max_size = max_size
+        self._entries: "OrderedDict[TKey, Tuple[float, TValue]]" = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: TKey) -> Optional[TValue]:
+        try:
+            expires_at, cached_value = self._entries[key]
+        except KeyError:
+            self.misses += 1
+            return None
+
+        if expires_at <= monotonic():
+            del self._entries[key]  # noqa: WPS420
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return cached_value
+
+    def set(self, key: TKey, cached_value: TValue) -> None:  # noqa: WPS125, A003
+        if self._ttl <= 0 or self._max_size <= 0:
+            return
+
+        self._entries[key] = (monotonic() + self._ttl, cached_value)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self._max_size:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def get_stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._entries)}
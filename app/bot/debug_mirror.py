@@ -0,0 +1,103 @@
+"""Background mirroring of requests to debug subscribers."""
+
+import asyncio
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+from uuid import UUID
+
+from pybotx import Bot, BotIsNotChatMemberError
+
+from app.bot.botx_method_utils import send_json_snippet
+from app.bot.datastructures import DebugSubscribers
+from app.bot.formatting import pformat_json
+from app.bot.outbound_scheduler import bulk_sends
+from app.logger import logger
+
+
+@dataclass
+class DebugSnippet:
+    bot: Bot
+    bot_id: UUID
+    chat_id: UUID
+    label: str
+    payload: Dict[str, Any]
+    filename: str
+
+
+class DebugMirror:
+    """Queue of snippets sent to subscribers of debugged chat.
+
+    Snippets are sent by background worker, so handlers don't wait for them.
+    If queue is full, new snippets are dropped.
+    """
+
+    def __init__(self, subscribers: DebugSubscribers, queue_max_size: int) -> None:
+        self._subscribers = subscribers
+        self._queue_max_size = queue_max_size
+        self._queue: Optional["asyncio.Queue[DebugSnippet]"] = None
+        self._worker_task: Optional["asyncio.Task[None]"] = None
+
+        self.dropped_count = 0
+
+    def start(self) -> None:
+        # Queue should be created in running event loop
+        self._queue = asyncio.Queue(self._queue_max_size)
+        self._worker_task = asyncio.create_task(self._work())
+
+    async def stop(self) -> None:
+        if self._worker_task is None:
+            return
+
+        self._worker_task.cancel()
+        await asyncio.gather(self._worker_task, return_exceptions=True)
+        self._worker_task = None
+
+    def mirror(self, snippet: DebugSnippet) -> None:
+        if self._queue is None:
+            return
+
+        try:
+            self._queue.put_nowait(snippet)
+        except asyncio.QueueFull:
+            self.dropped_count += 1
+
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            "queued_snippets": self._queue.qsize() if self._queue else 0,
+            "dropped_snippets": self.dropped_count,
+        }
+
+    async def _work(self) -> None:
+        assert self._queue
+
+        while True:  # noqa: WPS457
+            snippet = await self._queue.get()
+            subscribers_ids = self._subscribers.get(snippet.chat_id)
+            if not subscribers_ids:
+                continue
+
+            formatted_payload = pformat_json(snippet.payload)
+            with bulk_sends():
+                await asyncio.gather(
+                    *(
+                        self._send(snippet, subscriber_id, formatted_payload)
+                        for subscriber_id in subscribers_ids
+                    )
+                )
+
+    async def _send(
+        self, snippet: DebugSnippet, subscriber_id: UUID, formatted_payload: str
+    ) -> None:
+        try:
+            await send_json_snippet(
+                snippet.bot,
+                snippet.bot_id,
+                subscriber_id,
+                snippet.label,
+                formatted_payload,
+                snippet.filename,
+            )
+        except BotIsNotChatMemberError:
+            self._subscribers.remove(subscriber_id, snippet.chat_id)
+        except Exception:
+            logger.exception(f"Can't send debug snippet to {subscriber_id}")
@@ -0,0 +1,74 @@
+"""Scheduler of bot commands with per-chat ordering."""
+
+import asyncio
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+from pybotx.models.commands import BotCommand
+
+
+@dataclass
+class ChatQueue:
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    size: int = 0
+
+
+def get_chat_key(bot_command: BotCommand) -> Optional[Hashable]:
+    chat = getattr(bot_command, "chat", None)
+    return chat.id if chat else None
+
+
+class DispatchScheduler:
+    """Run commands of one chat one by one and chats in parallel.
+
+    Each chat waits for a free worker with at most one command (`asyncio.Lock`
+    and `asyncio.Semaphore` wake up waiters in FIFO order), so workers are
+    shared between chats in round-robin manner regardless of queue sizes.
+    """
+
+    def __init__(self, workers_count: int) -> None:
+        self._workers_count = workers_count
+        self._workers = asyncio.Semaphore(workers_count)
+        self._chat_queues: Dict[Hashable, ChatQueue] = {}
+        self._running_count = 0
+
+    async def run(
+        self,
+        chat_key: Optional[Hashable],
+        handle_command: Callable[..., Awaitable[None]],
+        *args: Any,
+    ) -> None:
+        if chat_key is None:
+            await self._run_on_worker(handle_command, *args)
+            return
+
+        chat_queue = self._chat_queues.get(chat_key)
+        if chat_queue is None:
+            chat_queue = ChatQueue()
+            self._chat_queues[chat_key] = chat_queue
+
+        chat_queue.size += 1
+        try:  # noqa: WPS501
+            async with chat_queue.lock:
+                await self._run_on_worker(handle_command, *args)
+        finally:
+            chat_queue.size -= 1
+            if not chat_queue.size:
+                self._chat_queues.pop(chat_key)
+
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            "workers": self._workers_count,
+            "running_commands": self._running_count,
+            "chats_with_commands": len(self._chat_queues),
+        }
+
+    async def _run_on_worker(
+        self, handle_command: Callable[..., Awaitable[None]], *args: Any
+    ) -> None:
+        async with self._workers:
+            self._running_count += 1
+            try:  # noqa: WPS501
+                await handle_command(*args)
+            finally:
+                self._running_count -= 1
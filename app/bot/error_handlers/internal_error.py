@@ -3,12 +3,14 @@
 from pybotx import Bot, BotShuttingDownError, IncomingMessage
 
 from app.logger import logger
+from app.metrics import HANDLER_EXCEPTIONS
 
 
 async def internal_error_handler(
     message: IncomingMessage, bot: Bot, exc: Exception
 ) -> None:
     logger.exception("Internal error:")
+    HANDLER_EXCEPTIONS.inc(type(exc).__name__)
 
     await bot.answer_message(
         "**Error:** internal error, please contact your system administrator",
@@ -0,0 +1,137 @@
+"""Concurrent file transfers to and from fileservice with timing report."""
+
+import asyncio
+from dataclasses import dataclass
+from time import perf_counter
+from typing import Awaitable, Callable, Iterable, List, Optional, Sequence, TypeVar
+from uuid import UUID
+
+from pybotx import Bot
+from pybotx.async_buffer import get_file_size
+from pybotx.models.attachments import IncomingFileAttachment
+
+from app.bot.spooled_buffer import SpooledAsyncBuffer
+from app.bot.zip_stream import ZipStreamWriter
+from app.settings import settings
+
+TTransferArg = TypeVar("TTransferArg")
+
+MEGABYTE = 1024 * 1024
+# Reply shouldn't exceed message length limit
+MAX_REPORT_ROWS = 50
+
+
+@dataclass
+class TransferResult:
+    name: str
+    size: int = 0
+    elapsed: float = 0
+    error: Optional[str] = None
+
+
+async def run_transfers(
+    transfer: Callable[[TTransferArg], Awaitable[TransferResult]],
+    transfer_args: Iterable[TTransferArg],
+    concurrency: Optional[int] = None,
+) -> List[TransferResult]:
+    semaphore = asyncio.Semaphore(concurrency or settings.FILE_TRANSFERS_CONCURRENCY)
+
+    async def run_transfer(  # noqa: WPS430
+        transfer_arg: TTransferArg,
+    ) -> TransferResult:
+        async with semaphore:
+            return await transfer(transfer_arg)
+
+    return await asyncio.gather(
+        *(run_transfer(transfer_arg) for transfer_arg in transfer_args)
+    )
+
+
+async def upload_attachment(
+    bot: Bot,
+    bot_id: UUID,
+    chat_id: UUID,
+    attachment: IncomingFileAttachment,
+    copy_number: int,
+) -> TransferResult:
+    transfer_result = TransferResult(name=f"{copy_number}.{attachment.filename}")
+    started_at = perf_counter()
+    try:
+        async with attachment.open() as async_buffer:
+            await bot.upload_file(
+                bot_id=bot_id,
+                chat_id=chat_id,
+                filename=attachment.filename,
+                async_buffer=async_buffer,
+            )
+    except Exception as exc:
+        transfer_result.error = type(exc).__name__
+    else:
+        transfer_result.size = attachment.size
+
+    transfer_result.elapsed = perf_counter() - started_at
+    return transfer_result
+
+
+async def download_to_zip(
+    bot: Bot,
+    bot_id: UUID,
+    chat_id: UUID,
+    zip_writer: ZipStreamWriter,
+    file_id: UUID,
+) -> TransferResult:
+    transfer_result = TransferResult(name=str(file_id))
+    started_at = perf_counter()
+    # File is downloaded before adding, so other downloads don't wait for
+    # archive entry being written
+    async with SpooledAsyncBuffer() as async_buffer:
+        try:
+            await bot.download_file(
+                bot_id=bot_id,
+                chat_id=chat_id,
+                file_id=file_id,
+                async_buffer=async_buffer,
+            )
+        except Exception as exc:
+            transfer_result.error = type(exc).__name__
+        else:
+            transfer_result.size = await get_file_size(async_buffer)
+
+        transfer_result.elapsed = perf_counter() - started_at
+        if not transfer_result.error:
+            await zip_writer.add_file(str(file_id), async_buffer)
+
+    return transfer_result
+
+
+def format_report(transfer_results: Sequence[TransferResult], elapsed: float) -> str:
+    rows = ["{0:<40}{1:>12}{2:>10}  {3}".format("file", "size", "time", "status")]
+    for transfer_result in transfer_results[:MAX_REPORT_ROWS]:
+        rows.append(
+            "{0:<40}{1:>9.2f} MB{2:>9.2f}s  {3}".format(
+                transfer_result.name,
+                transfer_result.size / MEGABYTE,
+                transfer_result.elapsed,
+                transfer_result.error or "ok",
+            )
+        )
+
+    if len(transfer_results) > MAX_REPORT_ROWS:
+        rows.append(f"... and {len(transfer_results) - MAX_REPORT_ROWS} more")
+
+    total_size = sum(result_row.size for result_row in transfer_results)
+    failed_names = [
+        result_row.name for result_row in transfer_results if result_row.error
+    ]
+    table = "\n".join(rows)
+    report = (
+        f"```\n{table}\n```\n"
+        f"**Total:** {total_size / MEGABYTE:.2f} MB in {elapsed:.2f}s "
+        f"({total_size / MEGABYTE / elapsed:.2f} MB/s), failed: {len(failed_names)}"
+    )
+
+    # Table is cut, but all failed transfers are listed
+    if failed_names:
+        report = f"{report}\n**Failed:** {', '.join(failed_names)}"
+
+    return report
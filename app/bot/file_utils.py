@@ -1,12 +1,82 @@
+from collections import OrderedDict
 from pathlib import Path
-from typing import Dict
+from typing import Dict, Optional, Tuple
+
+import aiofiles
+from pybotx import OutgoingAttachment
 
 from app.settings import settings
 
+# Path, modification time and size of file
+AttachmentCacheKey = Tuple[Path, int, int]
+
+
+class SampleFiles:
+    """Index of sample files by extension and cache of their attachments.
+
+    Index is rebuilt only when directory is changed. Attachments are cached
+    until total size of their content exceeds `cache_max_size` bytes.
+    """
+
+    def __init__(self, files_dir: Path, cache_max_size: int) -> None:
+        self._files_dir = files_dir
+        self._cache_max_size = cache_max_size
+        self._index: Dict[str, Path] = {}
+        self._indexed_dir_mtime: Optional[int] = None
+        self._attachments: "OrderedDict[AttachmentCacheKey, OutgoingAttachment]" = (
+            OrderedDict()
+        )
+        self._cached_size = 0
+
+    def get_file_paths(self) -> Dict[str, Path]:
+        dir_mtime = self._files_dir.stat().st_mtime_ns
+        if dir_mtime != self._indexed_dir_mtime:
+            self._index = self._build_index()
+            self._indexed_dir_mtime = dir_mtime
+
+        return self._index
+
+    async def get_attachment(self, extension: str) -> Optional[OutgoingAttachment]:
+        if not (file_path := self.get_file_paths().get(extension)):
+            return None
+
+        file_stat = file_path.stat()
+        cache_key = (file_path, file_stat.st_mtime_ns, file_stat.st_size)
+        if (attachment := self._attachments.get(cache_key)) is not None:
+            self._attachments.move_to_end(cache_key)
+            return attachment
+
+        async with aiofiles.open(file_path, "rb") as buffer:
+            attachment = await OutgoingAttachment.from_async_buffer(
+                buffer, f"file.{extension}"
+            )
+
+        self._cache_attachment(cache_key, attachment)
+
+        return attachment
+
+    def _build_index(self) -> Dict[str, Path]:
+        file_paths = {}
+        for file_sample in self._files_dir.iterdir():
+            extension = "".join(file_sample.suffixes).removeprefix(".")
+            file_paths[extension] = file_sample
+
+        return file_paths
+
+    def _cache_attachment(
+        self, cache_key: AttachmentCacheKey, attachment: OutgoingAttachment
+    ) -> None:
+        attachment_size = len(attachment.content)
+        # Same file could be read by concurrent commands
+        if attachment_size > self._cache_max_size or cache_key in self._attachments:
+            return
+
+        self._attachments[cache_key] = attachment
+        self._cached_size += attachment_size
+
+        while self._cached_size > self._cache_max_size:
+            _, evicted_attachment = self._attachments.popitem(last=False)
+            self._cached_size -= len(evicted_attachment.content)
+
 
-async def get_file_paths() -> Dict[str, Path]:
-    file_paths = {}
-    for file_sample in settings.FILES_DIR.iterdir():
-        extension = "".join(file_sample.suffixes).removeprefix(".")
-        file_paths[extension] = file_sample
-    return file_paths
+sample_files = SampleFiles(settings.FILES_DIR, settings.FILES_CACHE_MAX_SIZE)
@@ -1,17 +1,49 @@
 """Wrapper on HandlerCollector to pride additional commands."""
 
+import re
+from functools import partial
 from inspect import cleandoc
-from typing import Callable, Dict, Optional, Sequence, Union
+from typing import Callable, Dict, Iterator, Optional, Sequence, Tuple, Union
 
 from pybotx import HandlerCollector
-from pybotx.bot.handler import IncomingMessageHandlerFunc, Middleware, VisibleFunc
+from pybotx.bot.handler import (
+    BaseIncomingMessageHandler,
+    CommandHandler,
+    IncomingMessageHandlerFunc,
+    Middleware,
+    VisibleFunc,
+)
+from pybotx.logger import logger
 
+from app.bot.middlewares.metrics import build_handler_metrics_middleware
 
-class HandlerCollectorWithHelp(HandlerCollector):
+DEFAULT_HANDLER_METRICS_LABEL = "<default>"
+
+# Same as `body.split(maxsplit=1)[0]`, but without copying rest of the body
+COMMAND_NAME_REGEXP = re.compile(r"\s*(\S+)")
+
+
+def compose_middlewares(
+    message_handler: BaseIncomingMessageHandler,
+) -> IncomingMessageHandlerFunc:
+    """Build handler with middlewares like `BaseIncomingMessageHandler.__call__`."""
+    handler_func = message_handler.handler_func
+
+    for middleware in message_handler.middlewares[::-1]:
+        handler_func = partial(middleware, call_next=handler_func)
+
+    return handler_func
+
+
+class HandlerCollectorWithHelp(HandlerCollector):  # noqa: WPS214
     def __init__(self, middlewares: Optional[Sequence[Middleware]] = None) -> None:
         super().__init__(middlewares)
         self._helps_for_commands: Dict[str, str] = {}
 
+        # Command name to handler with composed middlewares
+        self._routing_index: Optional[Dict[str, IncomingMessageHandlerFunc]] = None
+        self._default_route: Optional[IncomingMessageHandlerFunc] = None
+
     def command_with_help(
         self,
         command_name: str,
@@ -45,6 +77,68 @@ class HandlerCollectorWithHelp(HandlerCollector):
     ) -> str:
         return self._helps_for_commands[command_name]
 
+    def find_command_help(self, command_name: str) -> Optional[str]:
+        return self._helps_for_commands.get(command_name)
+
+    def add_command_help(self, command_name: str, help_text: str) -> None:
+        self._helps_for_commands[command_name] = help_text
+
+    def iter_commands(self) -> Iterator[Tuple[str, CommandHandler]]:
+        yield from self._user_commands_handlers.items()
+
+    @property
+    def has_non_command_handlers(self) -> bool:
+        return bool(
+            self._default_message_handler
+            or self._system_events_handlers
+            or self._sync_smartapp_event_handler
+        )
+
+    def insert_handler_metrics_middlewares(self) -> None:
+        """Measure handlers duration including all their middlewares."""
+        for command_name, command_handler in self._user_commands_handlers.items():
+            command_handler.middlewares.insert(
+                0, build_handler_metrics_middleware(command_name)
+            )
+
+        if self._default_message_handler:
+            self._default_message_handler.middlewares.insert(
+                0, build_handler_metrics_middleware(DEFAULT_HANDLER_METRICS_LABEL)
+            )
+
+    def build_routing_index(self) -> None:
+        """Precompute middleware chains for dispatching messages.
+
+        Should be called again if handlers or their middlewares are changed.
+        """
+        self._routing_index = {
+            command_name: compose_middlewares(command_handler)
+            for command_name, command_handler in self._user_commands_handlers.items()
+        }
+
+        if self._default_message_handler:
+            self._default_route = compose_middlewares(self._default_message_handler)
+
+    def _get_command_handler(  # type: ignore[override]
+        self,
+        command: str,
+    ) -> Optional[IncomingMessageHandlerFunc]:
+        if self._routing_index is None:
+            return super()._get_command_handler(command)
+
+        if match := COMMAND_NAME_REGEXP.match(command):
+            command_name = match.group(1)
+            if route := self._routing_index.get(command_name):
+                logger.info("Found handler for command `{0}`", command_name)
+                return route
+
+        if self._default_route:
+            self._log_default_handler_call(self._get_command_name(command))
+            return self._default_route
+
+        logger.warning("Handler for message text `{0}` not found", command)
+        return None
+
     def _include_collector(self, other: "HandlerCollector") -> None:
         super()._include_collector(other)
 
@@ -0,0 +1,109 @@
+"""HTTP client for BotX requests with separate connection pool for each CTS host.
+
+So slow CTS host can exhaust only its own connections. Hosts of bot accounts
+added on the fly use shared default pool. Proxies from `HTTP_PROXY`,
+`HTTPS_PROXY`, `ALL_PROXY` and `NO_PROXY` are used the same way as in httpx.
+"""
+
+from functools import partial
+from typing import Any, Dict, Iterable, Optional
+
+import httpx
+from httpx._utils import URLPattern, get_environment_proxies  # noqa: WPS436
+
+DEFAULT_POOL_LABEL = "default"
+
+
+class PoolTransport(httpx.AsyncHTTPTransport):
+    """Transport counting connections of its pool."""
+
+    def get_pool_stats(self) -> Dict[str, int]:
+        connections = self._pool.connections
+        idle_count = sum(connection.is_idle() for connection in connections)
+
+        return {
+            "open": len(connections),
+            "idle": idle_count,
+            "active": len(connections) - idle_count,
+        }
+
+
+class PoolsHTTPClient(httpx.AsyncClient):
+    """Client keeping transports it was built with, labeled by host."""
+
+    def __init__(
+        self, pool_transports: Dict[str, PoolTransport], **kwargs: Any
+    ) -> None:
+        super().__init__(**kwargs)
+        self.pool_transports = pool_transports
+
+
+def get_proxy(url: httpx.URL, proxies: Dict[str, Optional[str]]) -> Optional[str]:
+    """Find proxy for URL, most specific pattern wins like in httpx."""
+    for url_pattern in sorted(URLPattern(pattern) for pattern in proxies):
+        if url_pattern.matches(url):
+            return proxies[url_pattern.pattern]
+
+    return None
+
+
+def build_httpx_client(  # noqa: WPS211
+    cts_urls: Iterable[str],
+    *,
+    max_connections: int,
+    max_keepalive_connections: int,
+    keepalive_expiry: float,
+    connect_timeout: float,
+    read_timeout: float,
+    write_timeout: float,
+    pool_timeout: float,
+    http2: bool,
+) -> PoolsHTTPClient:
+    build_transport = partial(
+        PoolTransport,
+        limits=httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        ),
+        http2=http2,
+    )
+    # Explicit transport disables proxies from environment, so they are mounted
+    proxies = get_environment_proxies()
+    mounts: Dict[str, Optional[httpx.AsyncBaseTransport]] = {
+        pattern: build_transport(proxy=proxy) if proxy else None
+        for pattern, proxy in proxies.items()
+    }
+    pool_transports = {DEFAULT_POOL_LABEL: build_transport()}
+    for pattern, mounted_transport in mounts.items():
+        if isinstance(mounted_transport, PoolTransport):
+            pool_transports[f"proxy {pattern}"] = mounted_transport
+
+    for cts_url in cts_urls:
+        url = httpx.URL(cts_url)
+        host = url.netloc.decode()
+        pool_transports[host] = build_transport(proxy=get_proxy(url, proxies))
+        mounts[f"all://{host}"] = pool_transports[host]
+
+    return PoolsHTTPClient(
+        pool_transports,
+        transport=pool_transports[DEFAULT_POOL_LABEL],
+        mounts=mounts,
+        timeout=httpx.Timeout(
+            connect=connect_timeout,
+            read=read_timeout,
+            write=write_timeout,
+            pool=pool_timeout,
+        ),
+    )
+
+
+def get_pool_stats(httpx_client: httpx.AsyncClient) -> Dict[str, Dict[str, int]]:
+    """Count open and idle connections in pool of each CTS host."""
+    if not isinstance(httpx_client, PoolsHTTPClient):
+        return {}
+
+    return {
+        label: transport.get_pool_stats()
+        for label, transport in httpx_client.pool_transports.items()
+    }
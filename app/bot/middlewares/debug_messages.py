@@ -2,7 +2,6 @@ from typing import Any, Dict, cast
 
 from pybotx import (
     Bot,
-    BotIsNotChatMemberError,
     ChatTypes,
     IncomingMessage,
     IncomingMessageHandlerFunc,
@@ -10,34 +9,38 @@ from pybotx import (
     MentionBuilder,
 )
 
-from app.bot.botx_method_utils import send_json_snippet
 from app.bot.datastructures import DebugSubscribers
-from app.bot.formatting import pformat_json
+from app.bot.debug_mirror import DebugMirror, DebugSnippet
+from app.bot.outgoing_requests_tap import OutgoingRequestsTap
+from app.bot.state_store import state_store
+from app.settings import settings
 
-subscribers_by_chat = DebugSubscribers()
+subscribers_by_chat = DebugSubscribers(state_store)
+debug_mirror = DebugMirror(subscribers_by_chat, settings.DEBUG_MIRROR_QUEUE_SIZE)
+outgoing_requests_tap = OutgoingRequestsTap(
+    subscribers_by_chat, debug_mirror, settings.DEBUG_DIGEST_INTERVAL
+)
 
 
 async def debug_incoming_message_middleware(
     message: IncomingMessage, bot: Bot, call_next: IncomingMessageHandlerFunc
 ) -> None:
-    raw_command = cast(Dict[str, Any], message.raw_command)
-    for subscriber_id in subscribers_by_chat.get(message.chat.id):
+    if subscribers_by_chat.has_subscribers(message.chat.id):
         mention: Mention
         if message.chat.type == ChatTypes.PERSONAL_CHAT:
             mention = MentionBuilder.contact(message.bot.id)
         else:
             mention = MentionBuilder.chat(message.chat.id)
 
-        try:
-            await send_json_snippet(
-                bot,
-                message.bot.id,
-                subscriber_id,
-                f"Incoming request from {mention}:",
-                pformat_json(raw_command),
-                "request.json",
+        debug_mirror.mirror(
+            DebugSnippet(
+                bot=bot,
+                bot_id=message.bot.id,
+                chat_id=message.chat.id,
+                label=f"Incoming request from {mention}:",
+                payload=cast(Dict[str, Any], message.raw_command),
+                filename="request.json",
             )
-        except BotIsNotChatMemberError:
-            subscribers_by_chat.remove(subscriber_id, message.chat.id)
+        )
 
     await call_next(message, bot)
@@ -0,0 +1,21 @@
+"""Middleware to measure command handlers duration."""
+
+from time import perf_counter
+
+from pybotx import Bot, IncomingMessage, IncomingMessageHandlerFunc
+from pybotx.bot.handler import Middleware
+
+from app.metrics import HANDLER_DURATION
+
+
+def build_handler_metrics_middleware(command_name: str) -> Middleware:
+    async def handler_metrics_middleware(  # noqa: WPS430
+        message: IncomingMessage, bot: Bot, call_next: IncomingMessageHandlerFunc
+    ) -> None:
+        started_at = perf_counter()
+        try:  # noqa: WPS501
+            await call_next(message, bot)
+        finally:
+            HANDLER_DURATION.observe(perf_counter() - started_at, command_name)
+
+    return handler_metrics_middleware
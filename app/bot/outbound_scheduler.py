@@ -0,0 +1,336 @@
+"""Rate limiting of outgoing messages.
+
+Each message waits for tokens of its bot account and its chat. Interactive
+messages are sent before bulk ones, chats with the same priority are served
+in round-robin manner.
+"""
+
+import asyncio
+from collections import OrderedDict, deque
+from contextlib import contextmanager, suppress
+from contextvars import ContextVar
+from dataclasses import dataclass
+from enum import IntEnum
+from itertools import chain
+from time import monotonic
+from typing import (
+    Awaitable,
+    Callable,
+    Deque,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    OrderedDict as OrderedDictType,
+    Tuple,
+    TypeVar,
+)
+from uuid import UUID
+
+from pybotx.client.exceptions.http import InvalidBotXStatusCodeError
+
+from app.logger import logger
+
+ChatKey = Tuple[UUID, UUID]
+TResult = TypeVar("TResult")
+
+THROTTLING_STATUS_CODE = 429
+# Full buckets of idle chats are dropped this often
+BUCKETS_PRUNE_INTERVAL = 60
+
+
+class SendPriority(IntEnum):
+    INTERACTIVE = 0
+    BULK = 1
+
+
+send_priority_var: ContextVar[SendPriority] = ContextVar(
+    "send_priority", default=SendPriority.INTERACTIVE
+)
+
+
+@contextmanager
+def bulk_sends() -> Iterator[None]:
+    """Send messages with bulk priority, tasks created inside inherit it."""
+    token = send_priority_var.set(SendPriority.BULK)
+    try:
+        yield
+    finally:
+        send_priority_var.reset(token)
+
+
+class OutboundQueueFullError(Exception):
+    """Too many messages are waiting to be sent."""
+
+
+class TokenBucket:
+    """Bucket with `0` rate is unlimited, only throttling pauses it."""
+
+    def __init__(self, rate: float, capacity: int) -> None:
+        self._rate = rate
+        self._capacity = capacity
+        self._tokens = float(capacity)
+        self._updated_at = monotonic()
+        self._paused_until: float = 0
+
+    def get_delay(self, now: float) -> float:
+        """Get seconds until token is available."""
+        if now < self._paused_until:
+            return self._paused_until - now
+
+        if not self._rate:
+            self._tokens = self._capacity
+            return 0
+
+        self._tokens = min(
+            self._capacity, self._tokens + (now - self._updated_at) * self._rate
+        )
+        self._updated_at = now
+
+        return max(0, (1 - self._tokens) / self._rate)
+
+    def take(self) -> None:
+        self._tokens -= 1
+
+    def pause(self, seconds: float) -> None:
+        now = monotonic()
+        self._paused_until = max(self._paused_until, now + seconds)
+        self._tokens = 0
+        self._updated_at = self._paused_until
+
+    def is_full(self, now: float) -> bool:
+        return self.get_delay(now) == 0 and self._tokens == self._capacity
+
+
+@dataclass
+class PendingSend:
+    bot_id: UUID
+    granted: "asyncio.Future[None]"
+
+
+ChatQueues = OrderedDictType[ChatKey, Deque[PendingSend]]
+
+
+def get_retry_after(exc: InvalidBotXStatusCodeError) -> Optional[float]:
+    if exc.response.status_code != THROTTLING_STATUS_CODE:
+        return None
+
+    with suppress(ValueError):
+        return float(exc.response.headers.get("retry-after", ""))
+
+    return 0
+
+
+class OutboundScheduler:  # noqa: WPS214
+    def __init__(  # noqa: WPS211
+        self,
+        bot_rate: float,
+        bot_burst: int,
+        chat_rate: float,
+        chat_burst: int,
+        queue_max_size: int,
+        max_retries: int = 3,
+        default_retry_after: float = 1,
+    ) -> None:
+        self._bot_rate = bot_rate
+        self._bot_burst = bot_burst
+        self._chat_rate = chat_rate
+        self._chat_burst = chat_burst
+        self._queue_max_size = queue_max_size
+        self._max_retries = max_retries
+        self._default_retry_after = default_retry_after
+
+        self._bot_buckets: Dict[UUID, TokenBucket] = {}
+        self._chat_buckets: Dict[ChatKey, TokenBucket] = {}
+        # Chats with waiting messages for each priority
+        self._queues: List[ChatQueues] = [OrderedDict() for _ in SendPriority]
+        self._pending_count = 0
+        self._pruned_at = monotonic()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._dispatcher_task: Optional["asyncio.Task[None]"] = None
+        # Message being granted, it is failed if granting raises
+        self._granting_send: Optional[PendingSend] = None
+
+        self.throttled_count = 0
+        self.rejected_count = 0
+
+    def start(self) -> None:
+        self._wakeup = asyncio.Event()
+        self._dispatcher_task = asyncio.create_task(self._dispatch())
+
+    async def stop(self) -> None:
+        if self._dispatcher_task is None:
+            return
+
+        self._dispatcher_task.cancel()
+        await asyncio.gather(self._dispatcher_task, return_exceptions=True)
+        self._dispatcher_task = None
+
+        for chat_queues in self._queues:
+            for pending_send in chain.from_iterable(chat_queues.values()):
+                pending_send.granted.cancel()
+
+            chat_queues.clear()
+
+        self._pending_count = 0
+
+    async def run(
+        self, bot_id: UUID, chat_id: UUID, send: Callable[[], Awaitable[TResult]]
+    ) -> TResult:
+        """Call `send` when rate limits allow, retry it if BotX throttles it."""
+        if self._dispatcher_task is None:
+            return await send()
+
+        chat_key = (bot_id, chat_id)
+        for _ in range(self._max_retries):
+            await self._acquire(bot_id, chat_key)
+            try:
+                return await send()
+            except InvalidBotXStatusCodeError as exc:
+                self._pause_throttled_bot(bot_id, exc)
+
+        await self._acquire(bot_id, chat_key)
+        return await send()
+
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            "pending_sends": self._pending_count,
+            "throttled_responses": self.throttled_count,
+            "rejected_sends": self.rejected_count,
+            "chat_buckets": len(self._chat_buckets),
+        }
+
+    def _pause_throttled_bot(
+        self, bot_id: UUID, exc: InvalidBotXStatusCodeError
+    ) -> None:
+        retry_after = get_retry_after(exc)
+        if retry_after is None:
+            raise exc
+
+        self.throttled_count += 1
+        self._get_bot_bucket(bot_id).pause(retry_after or self._default_retry_after)
+
+    async def _acquire(self, bot_id: UUID, chat_key: ChatKey) -> None:
+        assert self._wakeup
+
+        if self._pending_count >= self._queue_max_size:
+            self.rejected_count += 1
+            raise OutboundQueueFullError(
+                f"{self._pending_count} messages are waiting to be sent"
+            )
+
+        pending_send = PendingSend(bot_id, asyncio.get_running_loop().create_future())
+        chat_queues = self._queues[send_priority_var.get()]
+        chat_queues.setdefault(chat_key, deque()).append(pending_send)
+        self._pending_count += 1
+        self._wakeup.set()
+
+        await pending_send.granted
+
+    async def _dispatch(self) -> None:
+        assert self._wakeup
+
+        while True:  # noqa: WPS457
+            self._wakeup.clear()
+            try:
+                delay = self._grant_ready()
+            except Exception as exc:
+                logger.exception("Can't grant outgoing message")
+                self._fail_granting_send(exc)
+                continue
+
+            if delay is None:
+                await self._wakeup.wait()
+                continue
+
+            with suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self._wakeup.wait(), delay)
+
+    def _fail_granting_send(self, exc: Exception) -> None:
+        # Its sender would wait forever, failed message is dropped on next pass
+        pending_send = self._granting_send
+        self._granting_send = None
+        if pending_send is not None and not pending_send.granted.done():
+            pending_send.granted.set_exception(exc)
+
+    def _grant_ready(self) -> Optional[float]:
+        """Let through messages with tokens, return delay until next one."""
+        now = monotonic()
+        min_delay: Optional[float] = None
+
+        for chat_queues in self._queues:
+            # Next pass is made only if something was sent, so higher
+            # priority takes all tokens it can before lower one
+            granted_count = None
+            while granted_count != 0:
+                granted_count, pass_delay = self._grant_pass(chat_queues, now)
+                if pass_delay is not None:
+                    min_delay = min(pass_delay, min_delay or pass_delay)
+
+        if now - self._pruned_at > BUCKETS_PRUNE_INTERVAL:
+            self._prune_buckets(now)
+
+        return min_delay
+
+    def _grant_pass(
+        self, chat_queues: ChatQueues, now: float
+    ) -> Tuple[int, Optional[float]]:
+        granted_count = 0
+        min_delay: Optional[float] = None
+
+        for chat_key in list(chat_queues):
+            pending_sends = chat_queues[chat_key]
+            self._drop_cancelled(pending_sends)
+            if not pending_sends:
+                chat_queues.pop(chat_key)
+                continue
+
+            self._granting_send = pending_sends[0]
+            bot_bucket = self._get_bot_bucket(pending_sends[0].bot_id)
+            chat_bucket = self._get_chat_bucket(chat_key)
+            delay = max(bot_bucket.get_delay(now), chat_bucket.get_delay(now))
+            if delay:
+                self._granting_send = None
+                min_delay = min(delay, min_delay or delay)
+                continue
+
+            bot_bucket.take()
+            chat_bucket.take()
+            pending_sends.popleft().granted.set_result(None)
+            self._pending_count -= 1
+            granted_count += 1
+            chat_queues.move_to_end(chat_key)
+
+        self._granting_send = None
+        return granted_count, min_delay
+
+    def _drop_cancelled(self, pending_sends: Deque[PendingSend]) -> None:
+        # Sender could be cancelled while waiting or its granting failed
+        while pending_sends and pending_sends[0].granted.done():
+            pending_sends.popleft()
+            self._pending_count -= 1
+
+    def _get_bot_bucket(self, bot_id: UUID) -> TokenBucket:
+        bucket = self._bot_buckets.get(bot_id)
+        if bucket is None:
+            bucket = TokenBucket(self._bot_rate, self._bot_burst)
+            self._bot_buckets[bot_id] = bucket
+
+        return bucket
+
+    def _get_chat_bucket(self, chat_key: ChatKey) -> TokenBucket:
+        bucket = self._chat_buckets.get(chat_key)
+        if bucket is None:
+            bucket = TokenBucket(self._chat_rate, self._chat_burst)
+            self._chat_buckets[chat_key] = bucket
+
+        return bucket
+
+    def _prune_buckets(self, now: float) -> None:
+        self._pruned_at = now
+        self._chat_buckets = {
+            chat_key: bucket
+            for chat_key, bucket in self._chat_buckets.items()
+            if not bucket.is_full(now)
+            or any(chat_key in chat_queues for chat_queues in self._queues)
+        }
@@ -0,0 +1,123 @@
+"""Capture of outgoing BotX requests made while handling debugged chat."""
+
+import asyncio
+from dataclasses import dataclass, field
+from time import monotonic
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import UUID
+
+import httpx
+from pybotx import Bot
+from pybotx.bot.contextvars import bot_id_var, bot_var, chat_id_var
+
+from app.bot.datastructures import DebugSubscribers
+from app.bot.debug_mirror import DebugMirror, DebugSnippet
+
+STARTED_AT_EXTENSION = "debug_started_at"
+
+# Requests over this count are only counted in digest
+MAX_DIGEST_REQUESTS = 100
+
+
+@dataclass
+class RequestsDigest:
+    bot: Bot
+    requests: List[Dict[str, Any]] = field(default_factory=list)
+    skipped_count: int = 0
+
+
+def _get_content_length(headers: httpx.Headers) -> Optional[int]:
+    content_length = headers.get("content-length")
+    return int(content_length) if content_length else None
+
+
+class OutgoingRequestsTap:
+    """Httpx event hooks collecting requests digest for debug subscribers.
+
+    Chat is taken from pybotx context of handler which made a request, so
+    requests made by digest sending itself aren't captured.
+    """
+
+    def __init__(
+        self,
+        subscribers: DebugSubscribers,
+        debug_mirror: DebugMirror,
+        digest_interval: float,
+    ) -> None:
+        self._subscribers = subscribers
+        self._debug_mirror = debug_mirror
+        self._digest_interval = digest_interval
+        self._digests: Dict[Tuple[UUID, UUID], RequestsDigest] = {}
+        self._flush_task: Optional["asyncio.Task[None]"] = None
+
+    def start(self) -> None:
+        self._flush_task = asyncio.create_task(self._flush_periodically())
+
+    async def stop(self) -> None:
+        if self._flush_task is None:
+            return
+
+        self._flush_task.cancel()
+        await asyncio.gather(self._flush_task, return_exceptions=True)
+        self._flush_task = None
+
+    async def on_request(self, request: httpx.Request) -> None:
+        request.extensions[STARTED_AT_EXTENSION] = monotonic()
+
+    async def on_response(self, response: httpx.Response) -> None:
+        chat_id = chat_id_var.get(None)
+        if chat_id is None or not self._subscribers.has_subscribers(chat_id):
+            return
+
+        request = response.request
+        digest_key = (bot_id_var.get(), chat_id)
+        digest = self._digests.get(digest_key)
+        if digest is None:
+            digest = RequestsDigest(bot=bot_var.get())
+            self._digests[digest_key] = digest
+
+        if len(digest.requests) >= MAX_DIGEST_REQUESTS:
+            digest.skipped_count += 1
+            return
+
+        started_at = request.extensions.get(STARTED_AT_EXTENSION)
+        digest.requests.append(
+            {
+                "method": request.method,
+                # Query may contain signature for getting token
+                "url": str(request.url.copy_with(query=None)),
+                "status_code": response.status_code,
+                "request_size": _get_content_length(request.headers),
+                "response_size": _get_content_length(response.headers),
+                # Until response headers are received
+                "latency_ms": (
+                    round((monotonic() - started_at) * 1000, 1)
+                    if started_at is not None
+                    else None
+                ),
+            }
+        )
+
+    def flush(self) -> None:
+        digests = self._digests
+        self._digests = {}
+
+        for (bot_id, chat_id), digest in digests.items():
+            self._debug_mirror.mirror(
+                DebugSnippet(
+                    bot=digest.bot,
+                    bot_id=bot_id,
+                    chat_id=chat_id,
+                    label=f"Outgoing requests for chat `{chat_id}`:",
+                    payload={
+                        "requests": digest.requests,
+                        "skipped_requests": digest.skipped_count,
+                    },
+                    filename="requests.json",
+                )
+            )
+
+    async def _flush_periodically(self) -> None:
+        while True:  # noqa: WPS457
+            await asyncio.sleep(self._digest_interval)
+            self.flush()
@@ -27,7 +27,20 @@ SEARCH_USER_REGEXP = re.compile(
     r"|^(?P<by_ad>ad)\s+((?P<ad_login>\S+)\s+(?P<ad_domain>\S+))$"
     r"|^(?P<by_email>email)\s+(?P<email>\S+@\S+\.\S+)$"
 )
-SPAM_ARGS_REGEXP = re.compile(r"^(?P<quantity>\d+)(\s+(?P<delay>\d+))?$")
+DOWNLOAD_FILES_ARGS_REGEXP = re.compile(
+    r"^(?P<file_ids>[a-f0-9-]+(\s+[a-f0-9-]+)*)"
+    r"(\s+concurrency=(?P<concurrency>[1-9]\d*))?$",
+    re.IGNORECASE,
+)
+UPLOAD_FILES_ARGS_REGEXP = re.compile(
+    r"^(?P<copies>[1-9]\d*)?\s*(concurrency=(?P<concurrency>[1-9]\d*))?$"
+)
+SPAM_ARGS_REGEXP = re.compile(
+    r"^(?P<quantity>\d+)(\s+(?P<delay>\d+))?"
+    r"(\s+rate=(?P<rate>\d+(\.\d+)?))?"
+    r"(\s+concurrency=(?P<concurrency>[1-9]\d*))?"
+    r"(\s+(?P<no_callback>no_callback))?$"
+)
 
 USERS_AS_CSV_REGEXP = re.compile(
     r"^(?P<cts_user>(true|false)(\s|$))?"
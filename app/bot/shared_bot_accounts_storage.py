@@ -0,0 +1,66 @@
+"""Bot accounts storage aware of accounts added by other workers."""
+
+from typing import Iterator, List, Set
+from uuid import UUID
+
+from pybotx import BotAccountWithSecret, UnknownBotAccountError
+from pybotx.bot.bot_accounts_storage import BotAccountsStorage
+
+from app.bot.state_store import StateStore
+
+BOT_ACCOUNTS_NAMESPACE = "bot_accounts"
+ADDED_BOT_ACCOUNTS_KEY = "added"
+
+
+class SharedBotAccountsStorage(BotAccountsStorage):
+    def __init__(
+        self, bot_accounts: List[BotAccountWithSecret], store: StateStore
+    ) -> None:
+        super().__init__(bot_accounts)
+        self._store = store
+
+    def add_bot_account(self, bot_account: BotAccountWithSecret) -> None:
+        for raw_bot_account in self._get_raw_bot_accounts():
+            if BotAccountWithSecret.parse_raw(raw_bot_account).id == bot_account.id:
+                self._store.remove(
+                    BOT_ACCOUNTS_NAMESPACE, ADDED_BOT_ACCOUNTS_KEY, raw_bot_account
+                )
+
+        self._store.add(
+            BOT_ACCOUNTS_NAMESPACE, ADDED_BOT_ACCOUNTS_KEY, bot_account.json()
+        )
+        self._set_bot_account(bot_account)
+
+    def get_bot_account(self, bot_id: UUID) -> BotAccountWithSecret:
+        try:
+            return super().get_bot_account(bot_id)
+        except UnknownBotAccountError:
+            self.load_shared_bot_accounts()
+
+        return super().get_bot_account(bot_id)
+
+    def iter_bot_accounts(self) -> Iterator[BotAccountWithSecret]:
+        self.load_shared_bot_accounts()
+        yield from super().iter_bot_accounts()
+
+    def load_shared_bot_accounts(self) -> None:
+        for raw_bot_account in self._get_raw_bot_accounts():
+            self._set_bot_account(BotAccountWithSecret.parse_raw(raw_bot_account))
+
+    def _get_raw_bot_accounts(self) -> Set[str]:
+        return self._store.get_members(BOT_ACCOUNTS_NAMESPACE, ADDED_BOT_ACCOUNTS_KEY)
+
+    def _set_bot_account(self, bot_account: BotAccountWithSecret) -> None:
+        """Add bot account or replace one with the same id."""
+        for index, known_bot_account in enumerate(self._bot_accounts):
+            if known_bot_account.id != bot_account.id:
+                continue
+
+            if known_bot_account != bot_account:
+                self._bot_accounts[index] = bot_account
+                # Token could be got with old secret
+                self._auth_tokens.pop(bot_account.id, None)
+
+            return
+
+        self._bot_accounts.append(bot_account)
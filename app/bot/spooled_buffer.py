@@ -0,0 +1,87 @@
+"""Async file buffer kept in memory until it gets big."""
+
+import asyncio
+import io
+import os
+from tempfile import TemporaryFile
+from types import TracebackType
+from typing import IO, Any, Callable, Optional, Type, TypeVar
+
+from pybotx.async_buffer import AsyncBufferReadable, AsyncBufferWritable
+
+from app.settings import settings
+
+TResult = TypeVar("TResult")
+
+
+def create_disk_file(content: bytes, position: int) -> IO[bytes]:  # noqa: WPS110
+    disk_file = TemporaryFile()
+    disk_file.write(content)
+    disk_file.seek(position)
+
+    return disk_file
+
+
+class SpooledAsyncBuffer(AsyncBufferReadable, AsyncBufferWritable):  # noqa: WPS214
+    """Buffer for reading and writing files with pybotx.
+
+    Content is kept in memory until its size exceeds `max_size`, then it is
+    moved to temporary file. Only operations with file are run in threads.
+    """
+
+    def __init__(self, max_size: int = settings.SPOOLED_BUFFER_MAX_SIZE) -> None:
+        self._max_size = max_size
+        self._buffer: IO[bytes] = io.BytesIO()
+        self._in_memory = True
+
+    async def __aenter__(self) -> "SpooledAsyncBuffer":
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        await self.close()
+
+    @property
+    def in_memory(self) -> bool:
+        return self._in_memory
+
+    async def read(self, bytes_to_read: Optional[int] = None) -> bytes:
+        return await self._run(self._buffer.read, bytes_to_read)
+
+    async def write(self, content: bytes) -> int:  # noqa: WPS110
+        new_size = self._buffer.tell() + len(content)
+        if self._in_memory and new_size > self._max_size:
+            await self._rollover()
+
+        return await self._run(self._buffer.write, content)
+
+    async def seek(self, cursor: int, whence: int = os.SEEK_SET) -> int:
+        return await self._run(self._buffer.seek, cursor, whence)
+
+    async def tell(self) -> int:
+        return self._buffer.tell()
+
+    async def close(self) -> None:
+        await self._run(self._buffer.close)
+
+    async def _rollover(self) -> None:
+        memory_file = self._buffer
+        assert isinstance(memory_file, io.BytesIO)
+
+        disk_file = await asyncio.to_thread(
+            create_disk_file, memory_file.getvalue(), memory_file.tell()
+        )
+
+        self._buffer = disk_file
+        self._in_memory = False
+        memory_file.close()
+
+    async def _run(self, func: Callable[..., TResult], *args: Any) -> TResult:
+        if self._in_memory:
+            return func(*args)
+
+        return await asyncio.to_thread(func, *args)
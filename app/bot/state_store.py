@@ -0,0 +1,122 @@
+"""Storages for runtime state shared between workers.
+
+State is kept as sets of strings grouped by namespace and key. In-memory
+store works for a single worker only, SQLite store can be shared by all
+workers on the same host.
+"""
+
+import sqlite3
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, Optional, Protocol, Set, Tuple
+
+from app.settings import settings
+
+# Bot accounts are read synchronously by pybotx, so queries are run in event
+# loop and waiting for lock of other worker must be short
+BUSY_TIMEOUT_MS = 100
+# Database contains secrets of added bot accounts
+DB_FILE_MODE = 0o600
+
+
+class StateStore(Protocol):
+    def add(self, namespace: str, key: str, member: str) -> None:
+        """Add member to set."""
+
+    def remove(self, namespace: str, key: str, member: str) -> bool:
+        """Remove member from set and return `True` if it was there."""
+
+    def get_members(self, namespace: str, key: str) -> Set[str]:
+        """Get copy of set."""
+
+    def has_members(self, namespace: str, key: str) -> bool:
+        """Check if set isn't empty without copying it."""
+
+
+class MemoryStateStore:
+    def __init__(self) -> None:
+        self._sets: Dict[Tuple[str, str], Set[str]] = defaultdict(set)
+
+    def add(self, namespace: str, key: str, member: str) -> None:
+        self._sets[namespace, key].add(member)
+
+    def remove(self, namespace: str, key: str, member: str) -> bool:
+        members = self._sets.get((namespace, key))
+        if members is None or member not in members:
+            return False
+
+        members.remove(member)
+        return True
+
+    def get_members(self, namespace: str, key: str) -> Set[str]:
+        members = self._sets.get((namespace, key))
+        if members is None:
+            return set()
+
+        return members.copy()
+
+    def has_members(self, namespace: str, key: str) -> bool:
+        return bool(self._sets.get((namespace, key)))
+
+
+class SQLiteStateStore:
+    """Store in local SQLite database in WAL mode.
+
+    Queries are tiny and local, so they are run right in the event loop.
+    Database file is readable by its owner only.
+    """
+
+    def __init__(self, db_path: Path) -> None:
+        db_path.touch(mode=DB_FILE_MODE)
+        db_path.chmod(DB_FILE_MODE)
+        # Autocommit mode, each statement is a separate transaction
+        self._connection = sqlite3.connect(
+            db_path, isolation_level=None, check_same_thread=False
+        )
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute(f"PRAGMA busy_timeout={BUSY_TIMEOUT_MS}")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS state_members ("  # noqa: WPS323
+            "namespace TEXT NOT NULL, "
+            "key TEXT NOT NULL, "
+            "member TEXT NOT NULL, "
+            "PRIMARY KEY (namespace, key, member))"
+        )
+
+    def add(self, namespace: str, key: str, member: str) -> None:
+        self._connection.execute(
+            "INSERT OR IGNORE INTO state_members VALUES (?, ?, ?)",
+            (namespace, key, member),
+        )
+
+    def remove(self, namespace: str, key: str, member: str) -> bool:
+        cursor = self._connection.execute(
+            "DELETE FROM state_members WHERE namespace = ? AND key = ? AND member = ?",
+            (namespace, key, member),
+        )
+        return cursor.rowcount > 0
+
+    def get_members(self, namespace: str, key: str) -> Set[str]:
+        cursor = self._connection.execute(
+            "SELECT member FROM state_members WHERE namespace = ? AND key = ?",
+            (namespace, key),
+        )
+        return {row[0] for row in cursor}
+
+    def has_members(self, namespace: str, key: str) -> bool:
+        cursor = self._connection.execute(
+            "SELECT 1 FROM state_members WHERE namespace = ? AND key = ? LIMIT 1",
+            (namespace, key),
+        )
+        return cursor.fetchone() is not None
+
+
+def build_state_store(db_path: Optional[Path]) -> StateStore:
+    if db_path is None:
+        return MemoryStateStore()
+
+    return SQLiteStateStore(db_path)
+
+
+state_store = build_state_store(settings.STATE_STORE_PATH)
@@ -0,0 +1,65 @@
+"""Zip archive written on the fly into async buffer."""
+
+import asyncio
+import zipfile
+from typing import IO, List, cast
+
+from pybotx.async_buffer import AsyncBufferReadable, AsyncBufferWritable
+from pybotx.constants import CHUNK_SIZE
+
+
+class ZipSink:
+    """Unseekable output of `zipfile` collecting written chunks."""
+
+    def __init__(self) -> None:
+        self._chunks: List[bytes] = []
+        self._position = 0
+
+    def write(self, chunk: bytes) -> int:
+        self._chunks.append(chunk)
+        self._position += len(chunk)
+        return len(chunk)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self) -> None:
+        """Chunks are taken by `pop_chunks`."""
+
+    def pop_chunks(self) -> bytes:
+        chunks = b"".join(self._chunks)
+        self._chunks.clear()
+        return chunks
+
+
+class ZipStreamWriter:
+    """Write archive entries one by one without seeking back.
+
+    Written part of archive is passed to async buffer after each chunk, so
+    archive isn't kept in memory. Files are stored without compression.
+    """
+
+    def __init__(self, async_buffer: AsyncBufferWritable) -> None:
+        self._async_buffer = async_buffer
+        self._sink = ZipSink()
+        self._zip_file = zipfile.ZipFile(cast(IO[bytes], self._sink), "w")
+        self._lock = asyncio.Lock()
+
+    async def add_file(self, name: str, source: AsyncBufferReadable) -> None:
+        # Entries can't be interleaved
+        async with self._lock:
+            with self._zip_file.open(name, "w", force_zip64=True) as entry:
+                while chunk := await source.read(CHUNK_SIZE):
+                    entry.write(chunk)
+                    await self._flush()
+
+            await self._flush()
+
+    async def close(self) -> None:
+        async with self._lock:
+            self._zip_file.close()
+            await self._flush()
+
+    async def _flush(self) -> None:
+        if chunks := self._sink.pop_chunks():
+            await self._async_buffer.write(chunks)
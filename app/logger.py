@@ -1,15 +1,16 @@
 """Configured application logger."""
 
 import logging
+import random
 import sys
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Callable, Dict
 
 from loguru import logger as _logger
 
 from app.settings import settings
 
 if TYPE_CHECKING:  # To avoid circular import
-    from loguru import Logger
+    from loguru import Logger, Record
 
 
 # This code copied from loguru docs, ignoring all linters warnings
@@ -33,14 +34,36 @@ class InterceptHandler(logging.Handler):
         )
 
 
+def build_sampling_filter(
+    sampling_rates: Dict[str, float]
+) -> Callable[["Record"], bool]:
+    """Pass only part of records with sampled levels.
+
+    Levels without rate are always passed.
+    """
+
+    def sampling_filter(record: "Record") -> bool:  # noqa: WPS430
+        sampling_rate = sampling_rates.get(record["level"].name)
+        if sampling_rate is None:
+            return True
+
+        # Not used for security purposes
+        return random.random() < sampling_rate  # noqa: S311
+
+    return sampling_filter
+
+
 def setup_logger() -> "Logger":
+    log_level = logging.DEBUG if settings.DEBUG else logging.INFO
+
     # Remove every other logger's handlers and propagate to root logger
     for name in logging.root.manager.loggerDict.keys():
         logging.getLogger(name).handlers = []
         logging.getLogger(name).propagate = True
 
-    # Intercept everything at the root logger
-    logging.basicConfig(handlers=[InterceptHandler()], level=0)
+    # Intercept everything at the root logger. Disabled records are dropped
+    # by stdlib logging, so frames aren't inspected for them.
+    logging.basicConfig(handlers=[InterceptHandler()], level=log_level)
 
     _logger.disable("httpx")
 
@@ -49,7 +72,15 @@ def setup_logger() -> "Logger":
         handlers=[
             {
                 "sink": sys.stdout,
-                "level": logging.DEBUG if settings.DEBUG else logging.INFO,
+                "level": log_level,
+                # Write from background thread, so event loop isn't blocked
+                "enqueue": settings.LOG_ENQUEUE,
+                "serialize": settings.LOG_JSON,
+                "filter": (
+                    build_sampling_filter(settings.LOG_SAMPLING)
+                    if settings.LOG_SAMPLING
+                    else None
+                ),
             }
         ],
     )
@@ -1,25 +1,73 @@
 """Application with configuration for events, routers and middleware."""
+from functools import partial
+
 from fastapi import FastAPI
 
+from app.api.admission import AdmissionController
+from app.api.middlewares.metrics import RequestMetricsMiddleware
 from app.api.routers import router
+from app.api.shutdown import ShutdownDrainer
 from app.bot.bot import bot
 from app.bot.datastructures import CTSEventsListeners
+from app.bot.middlewares.debug_messages import debug_mirror, outgoing_requests_tap
+from app.bot.state_store import state_store
+from app.logger import logger
+from app.metrics import registry
+from app.settings import settings
 
 
 async def startup() -> None:
     await bot.startup()
-    bot.state.chats_listening_cts_events = CTSEventsListeners()
+    bot.state.chats_listening_cts_events = CTSEventsListeners(state_store)
+    if bot.outbound_scheduler:
+        bot.outbound_scheduler.start()
+    debug_mirror.start()
+    outgoing_requests_tap.start()
+
+
+async def shutdown(shutdown_drainer: ShutdownDrainer) -> None:
+    # Handlers are already drained if server was stopped with SIGTERM
+    await shutdown_drainer.drain(is_serving=False)
+
+    await bot.shutdown()
+    await outgoing_requests_tap.stop()
+    await debug_mirror.stop()
+    if bot.outbound_scheduler:
+        await bot.outbound_scheduler.stop()
+
+    # Flush enqueued log records
+    await logger.complete()
+
+
+def register_stats_sources(admission_controller: AdmissionController) -> None:
+    registry.add_stats_source("admission", admission_controller.get_stats)
+    registry.add_stats_source("status_cache", bot.status_cache.get_stats)
+    registry.add_stats_source("callbacks", bot.callback_stats.get_stats)
+    registry.add_stats_source("debug_mirror", debug_mirror.get_stats)
+    if bot.dispatch_scheduler:
+        registry.add_stats_source("dispatch", bot.dispatch_scheduler.get_stats)
+    if bot.outbound_scheduler:
+        registry.add_stats_source("outbound", bot.outbound_scheduler.get_stats)
 
 
 def get_application() -> FastAPI:
     """Create configured server application instance."""
     application = FastAPI(title="next-feature-bot")
     application.state.bot = bot
+    admission_controller = AdmissionController(bot, settings.MAX_IN_FLIGHT_COMMANDS)
+    application.state.admission_controller = admission_controller
+    shutdown_drainer = ShutdownDrainer(
+        bot, admission_controller, settings.SHUTDOWN_DRAIN_TIMEOUT
+    )
+
+    register_stats_sources(admission_controller)
 
     application.add_event_handler("startup", startup)
-    application.add_event_handler("shutdown", bot.shutdown)
+    application.add_event_handler("startup", shutdown_drainer.install_signal_handler)
+    application.add_event_handler("shutdown", partial(shutdown, shutdown_drainer))
 
     application.include_router(router)
+    application.add_middleware(RequestMetricsMiddleware)
 
     return application
 
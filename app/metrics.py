@@ -0,0 +1,185 @@
+"""Application metrics in Prometheus text format.
+
+Metrics are updated from the event loop only, so plain counters without
+locks are enough.
+"""
+
+from bisect import bisect_left
+from typing import Callable, Dict, Iterator, List, Mapping, Sequence, Tuple, Union
+
+LabelValues = Tuple[str, ...]
+StatValue = Union[int, float]
+StatsSource = Callable[[], Mapping[str, StatValue]]
+
+DEFAULT_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1,
+    2.5,
+    5,
+    10,
+    30,
+)
+
+
+def _escape_label_value(label_value: str) -> str:
+    return label_value.replace("\\", r"\\").replace("\n", r"\n").replace('"', r"\"")
+
+
+def _format_labels(label_names: Sequence[str], label_values: Sequence[str]) -> str:
+    if not label_names:
+        return ""
+
+    labels = ",".join(
+        f'{label_name}="{_escape_label_value(label_value)}"'
+        for label_name, label_value in zip(label_names, label_values)
+    )
+    return f"{{{labels}}}"
+
+
+class Metric:
+    metric_type = "untyped"
+
+    def __init__(
+        self, name: str, documentation: str, label_names: Sequence[str] = ()
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+
+    def collect(self) -> Iterator[str]:
+        yield from (
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.metric_type}",
+        )
+        yield from self._collect_samples()
+
+    def _collect_samples(self) -> Iterator[str]:
+        raise NotImplementedError
+
+
+class Counter(Metric):
+    metric_type = "counter"
+
+    def __init__(
+        self, name: str, documentation: str, label_names: Sequence[str] = ()
+    ) -> None:
+        super().__init__(name, documentation, label_names)
+        self._counts: Dict[LabelValues, float] = {}
+
+    def inc(self, *label_values: str, amount: float = 1) -> None:
+        self._counts[label_values] = self._counts.get(label_values, 0) + amount
+
+    def _collect_samples(self) -> Iterator[str]:
+        for label_values, metric_value in self._counts.items():
+            labels = _format_labels(self.label_names, label_values)
+            yield f"{self.name}{labels} {metric_value}"
+
+
+class Histogram(Metric):
+    metric_type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        label_names: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        super().__init__(name, documentation, label_names)
+        self._upper_bounds = sorted(buckets)
+        # Per bucket counts (last one is `+Inf`) and sum of observed values
+        self._buckets: Dict[LabelValues, List[int]] = {}
+        self._sums: Dict[LabelValues, float] = {}
+
+    def observe(self, observed_value: float, *label_values: str) -> None:
+        bucket_counts = self._buckets.get(label_values)
+        if bucket_counts is None:
+            bucket_counts = [0 for _ in range(len(self._upper_bounds) + 1)]
+            self._buckets[label_values] = bucket_counts
+            self._sums[label_values] = 0
+
+        bucket_counts[bisect_left(self._upper_bounds, observed_value)] += 1
+        self._sums[label_values] += observed_value
+
+    def _collect_samples(self) -> Iterator[str]:
+        bucket_label_names = self.label_names + ("le",)
+        upper_bounds = [str(bound) for bound in self._upper_bounds] + ["+Inf"]
+
+        for label_values, bucket_counts in self._buckets.items():
+            cumulative_count = 0
+            for upper_bound, bucket_count in zip(upper_bounds, bucket_counts):
+                cumulative_count += bucket_count
+                bucket_label_values = label_values + (upper_bound,)
+                labels = _format_labels(bucket_label_names, bucket_label_values)
+                yield f"{self.name}_bucket{labels} {cumulative_count}"
+
+            labels = _format_labels(self.label_names, label_values)
+            observed_sum = self._sums[label_values]
+            yield from (
+                f"{self.name}_sum{labels} {observed_sum}",
+                f"{self.name}_count{labels} {cumulative_count}",
+            )
+
+
+class MetricsRegistry:
+    def __init__(self, prefix: str) -> None:
+        self._prefix = prefix
+        self._metrics: List[Metric] = []
+        self._stats_sources: Dict[str, StatsSource] = {}
+
+    def counter(
+        self, name: str, documentation: str, label_names: Sequence[str] = ()
+    ) -> Counter:
+        counter = Counter(self._prefix + name, documentation, label_names)
+        self._metrics.append(counter)
+        return counter
+
+    def histogram(
+        self, name: str, documentation: str, label_names: Sequence[str] = ()
+    ) -> Histogram:
+        histogram = Histogram(self._prefix + name, documentation, label_names)
+        self._metrics.append(histogram)
+        return histogram
+
+    def add_stats_source(self, name: str, stats_source: StatsSource) -> None:
+        """Export values from `get_stats()`-like callable on every render."""
+        self._stats_sources[name] = stats_source
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.collect())
+
+        for source_name, stats_source in self._stats_sources.items():
+            for stat_name, stat_value in stats_source().items():
+                metric_name = f"{self._prefix}{source_name}_{stat_name}"
+                lines.append(f"# TYPE {metric_name} untyped")
+                lines.append(f"{metric_name} {stat_value}")
+
+        lines.append("")
+        return "\n".join(lines)
+
+
+registry = MetricsRegistry(prefix="next_feature_bot_")
+
+REQUEST_DURATION = registry.histogram(
+    "request_duration_seconds",
+    "Time spent processing HTTP request.",
+    ["path", "status_code"],
+)
+HANDLER_DURATION = registry.histogram(
+    "handler_duration_seconds",
+    "Time spent in command handler including middlewares.",
+    ["command"],
+)
+HANDLER_EXCEPTIONS = registry.counter(
+    "handler_exceptions_total",
+    "Exceptions caught by internal error handler.",
+    ["exception"],
+)
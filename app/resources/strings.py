@@ -4,6 +4,8 @@ from typing import Any, Protocol, cast
 
 from mako.lookup import TemplateLookup
 
+from app.settings import settings
+
 
 class FormatTemplate(Protocol):
     """
@@ -30,8 +32,10 @@ class TemplateFormatterLookup(TemplateLookup):  # type: ignore
         return cast(FormatTemplate, template)
 
 
+# Compiled templates are stored on disk, so next processes don't compile them again
 lookup = TemplateFormatterLookup(
     directories=["app/resources/templates"],
+    module_directory=settings.TEMPLATES_MODULE_DIR,
     input_encoding="utf-8",
     strict_undefined=True,
 )
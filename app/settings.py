@@ -1,6 +1,6 @@
 """Application settings."""
 from pathlib import Path
-from typing import Any, List
+from typing import Any, Dict, List, Optional
 from uuid import UUID
 
 from pybotx import BotAccountWithSecret
@@ -18,7 +18,80 @@ class AppSettings(BaseSettings):
     # base kwargs
     DEBUG: bool = False
 
+    # logging
+    LOG_ENQUEUE: bool = False
+    LOG_JSON: bool = False
+    # Part of records to keep for each level, e.g. `{"DEBUG": 0.01}`
+    LOG_SAMPLING: Dict[str, float] = {}
+
     FILES_DIR: Path = Path("files")
+    # file transfers run at once by `/upload-files` and `/download-files`
+    FILE_TRANSFERS_CONCURRENCY: int = 4
+    # total size in bytes (16 MiB) of sample files kept in memory,
+    # `0` disables caching
+    FILES_CACHE_MAX_SIZE: int = 16777216
+
+    # size in bytes (1 MiB) of downloaded files and snippets kept in memory,
+    # bigger ones are moved to temporary files
+    SPOOLED_BUFFER_MAX_SIZE: int = 1048576
+
+    # register commands from manifest and import their modules on first use
+    LAZY_COMMANDS: bool = False
+
+    # compiled Mako templates, templates are compiled in memory if not set,
+    # modules found there are executed, so directory must be owned by bot
+    TEMPLATES_MODULE_DIR: Optional[Path] = None
+
+    # SQLite database with state shared between workers,
+    # state is kept in memory if not set
+    STATE_STORE_PATH: Optional[Path] = None
+
+    # BotX HTTP client, each CTS host has its own connection pool with these
+    # limits, HTTP/2 requires `h2` package (`http2` extra)
+    HTTP_MAX_CONNECTIONS: int = 100
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    HTTP_KEEPALIVE_EXPIRY: float = 5
+    HTTP_CONNECT_TIMEOUT: float = 5
+    HTTP_READ_TIMEOUT: float = 5
+    HTTP_WRITE_TIMEOUT: float = 5
+    HTTP_POOL_TIMEOUT: float = 5
+    HTTP2: bool = False
+
+    # admission control, `0` disables the limit
+    MAX_IN_FLIGHT_COMMANDS: int = 1000
+    RETRY_AFTER_SECONDS: int = 1
+
+    # workers handling commands, commands of one chat are handled in order,
+    # so long command delays next ones of the chat, `0` starts handling each
+    # command immediately without ordering
+    DISPATCH_WORKERS: int = 0
+
+    # outgoing messages per second and burst size for each bot account and
+    # chat, `0` rate is unlimited, `0` bot rate sends messages without queue
+    OUTBOUND_BOT_RATE: float = 0
+    OUTBOUND_BOT_BURST: int = 500
+    OUTBOUND_CHAT_RATE: float = 20
+    OUTBOUND_CHAT_BURST: int = 20
+    # messages waiting to be sent, extra ones fail
+    OUTBOUND_QUEUE_SIZE: int = 10000
+
+    # snippets waiting to be sent to debug subscribers, extra ones are dropped
+    DEBUG_MIRROR_QUEUE_SIZE: int = 1000
+    # seconds between digests of outgoing requests made in debugged chat
+    DEBUG_DIGEST_INTERVAL: float = 5
+
+    # messages about cts events sent to listening chats at once
+    CTS_EVENTS_BROADCAST_CONCURRENCY: int = 20
+
+    # seconds to wait for running handlers on shutdown before cancelling them
+    SHUTDOWN_DRAIN_TIMEOUT: float = 30
+
+    # `/status` responses cache, `0` disables caching
+    STATUS_CACHE_TTL: float = 10
+    STATUS_CACHE_MAX_SIZE: int = 1024
+
+    # count of recent callback latencies kept for each BotX method
+    CALLBACK_STATS_SIZE: int = 1000
 
     @validator("BOT_CREDENTIALS", pre=True)
     @classmethod
@@ -35,6 +108,14 @@ class AppSettings(BaseSettings):
             for credentials_str in raw_credentials.replace(",", " ").split()
         ]
 
+    @validator("OUTBOUND_BOT_RATE", "OUTBOUND_CHAT_RATE")
+    @classmethod
+    def check_outbound_rate(cls, rate: float) -> float:
+        if rate < 0:
+            raise ValueError("Rate can't be negative, use `0` for unlimited rate")
+
+        return rate
+
     @classmethod
     def _build_credentials_from_string(
         cls, credentials_str: str
@@ -0,0 +1,68 @@
+"""Report cold start import time of the application.
+
+Runs `python -X importtime -c "import app.main"` in eager and lazy commands
+modes and prints total import time and the heaviest top-level packages.
+
+Run from the project root:
+
+    BOT_CREDENTIALS="cts.example.com@secret@$(uuidgen)" \\
+        PYTHONPATH=. python scripts/benchmarks/importtime.py
+"""
+
+import argparse
+import os
+import subprocess  # noqa: S404
+import sys
+from collections import Counter
+from typing import Dict, Tuple
+
+IMPORTED_MODULE = "app.main"
+IMPORTTIME_PREFIX = "import time:"
+
+
+def measure_imports(lazy_commands: bool) -> Tuple[int, Dict[str, int]]:
+    """Return total import time and self time of top-level packages (in us)."""
+    process = subprocess.run(  # noqa: S603
+        [sys.executable, "-X", "importtime", "-c", f"import {IMPORTED_MODULE}"],
+        env={**os.environ, "LAZY_COMMANDS": str(lazy_commands).lower()},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    total_time = 0
+    packages_time: Dict[str, int] = Counter()
+    for line in process.stderr.splitlines():
+        if not line.startswith(IMPORTTIME_PREFIX):
+            continue
+
+        self_time, cumulative_time, module_name = line[len(IMPORTTIME_PREFIX) :].split(
+            "|"
+        )
+        if not self_time.strip().isdigit():
+            continue  # header
+
+        package_name = module_name.strip().split(".")[0]
+        packages_time[package_name] += int(self_time)
+        if module_name.strip() == IMPORTED_MODULE:
+            total_time = int(cumulative_time)
+
+    return total_time, packages_time
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    for lazy_commands in (False, True):
+        total_time, packages_time = measure_imports(lazy_commands)
+        mode = "lazy" if lazy_commands else "eager"
+        print(f"{mode} commands: `import {IMPORTED_MODULE}` {total_time / 1000:.1f}ms")
+
+        for package_name, package_time in Counter(packages_time).most_common(args.top):
+            print(f"    {package_name:<30}{package_time / 1000:>8.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""Compare default and indexed command dispatch of bot handler collector.
+
+Collectors are rebuilt with all registered command names and the same number
+of middlewares per handler, but handlers and middlewares do nothing, so only
+dispatch cost is measured.
+
+Run from the project root:
+
+    BOT_CREDENTIALS="cts.example.com@secret@$(uuidgen)" \\
+        PYTHONPATH=. python scripts/benchmarks/routing.py
+"""
+
+import asyncio
+import random
+import time
+from types import SimpleNamespace
+from typing import Any, List
+from uuid import uuid4
+
+from loguru import logger
+from pybotx import HandlerCollector
+
+from app.bot.bot import bot
+from app.bot.handler_with_help import HandlerCollectorWithHelp
+
+MESSAGES_COUNT = 100_000
+# Part of messages which are plain text handled by default handler
+PLAIN_TEXT_RATE = 0.1
+
+
+async def noop_handler(*_: Any) -> None:
+    """Handler doing nothing."""
+
+
+async def noop_middleware(message: Any, bot: Any, call_next: Any) -> None:
+    await call_next(message, bot)
+
+
+def fill_collector(collector: HandlerCollector) -> None:
+    command_handlers = bot._handler_collector._user_commands_handlers  # noqa: WPS437
+    for command_name, command_handler in command_handlers.items():
+        collector.command(
+            command_name,
+            visible=False,
+            middlewares=[noop_middleware] * len(command_handler.middlewares),
+        )(noop_handler)
+
+    collector.default_message_handler(noop_handler)
+
+
+def build_messages() -> List[Any]:
+    command_names = list(bot._handler_collector._user_commands_handlers)  # noqa: WPS437
+    bot_account = SimpleNamespace(id=uuid4())
+    chat = SimpleNamespace(id=uuid4())
+
+    messages = []
+    for _ in range(MESSAGES_COUNT):
+        if random.random() < PLAIN_TEXT_RATE:
+            body = "some plain text message"
+        else:
+            body = f"{random.choice(command_names)} some arguments"
+
+        messages.append(SimpleNamespace(body=body, bot=bot_account, chat=chat))
+
+    return messages
+
+
+async def dispatch_all(collector: HandlerCollector, messages: List[Any]) -> float:
+    started_at = time.perf_counter()
+    for message in messages:
+        await collector.handle_incoming_message_by_command(message, bot, message.body)
+
+    return time.perf_counter() - started_at
+
+
+async def main() -> None:
+    # Both paths log found handler, measure dispatch without log sinks
+    logger.remove()
+
+    default_collector = HandlerCollector()
+    fill_collector(default_collector)
+
+    indexed_collector = HandlerCollectorWithHelp()
+    fill_collector(indexed_collector)
+    indexed_collector.build_routing_index()
+
+    messages = build_messages()
+    commands_count = len(indexed_collector._user_commands_handlers)  # noqa: WPS437
+    print(f"{len(messages)} messages, {commands_count} commands")
+
+    for label, collector in (
+        ("default", default_collector),
+        ("indexed", indexed_collector),
+    ):
+        elapsed = await dispatch_all(collector, messages)
+        print(
+            f"{label:<10} {elapsed:.3f}s  "
+            f"{elapsed / len(messages) * 1_000_000:.2f}us/message"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,97 @@
+"""Compare stdlib and fast JSON paths used by BotX endpoints.
+
+Run from the project root:
+
+    PYTHONPATH=. python scripts/benchmarks/serialization.py
+"""
+
+import json
+import timeit
+from typing import Any, Callable, Dict
+from uuid import uuid4
+
+from fastapi.responses import JSONResponse
+from pybotx import build_command_accepted_response
+
+from app.api.serialization import command_accepted_response, json_loads, orjson
+
+ITERATIONS = 2000
+PAYLOAD_SIZES_KB = (2, 5, 10, 20)
+
+
+def build_raw_command(size_kb: int) -> bytes:
+    """Build command similar to the ones sent by BotX, padded up to size."""
+    raw_command: Dict[str, Any] = {
+        "bot_id": str(uuid4()),
+        "command": {
+            "body": "/echo hello",
+            "command_type": "user",
+            "data": {},
+            "metadata": {},
+        },
+        "attachments": [],
+        "async_files": [],
+        "entities": [],
+        "source_sync_id": None,
+        "sync_id": str(uuid4()),
+        "from": {
+            "ad_domain": "domain",
+            "ad_login": "login",
+            "app_version": "1.21.9",
+            "chat_type": "chat",
+            "device": "Chrome",
+            "device_meta": {"permissions": {}, "pushes": False, "timezone": "UTC"},
+            "device_software": "macOS 10.15.7",
+            "group_chat_id": str(uuid4()),
+            "host": "cts.example.com",
+            "is_admin": True,
+            "is_creator": True,
+            "locale": "en",
+            "manufacturer": "Google",
+            "platform": "web",
+            "platform_package_id": "ru.unlimitedtech.express",
+            "user_huid": str(uuid4()),
+            "username": "Ivanov Ivan Ivanovich",
+        },
+        "proto_version": 4,
+    }
+
+    size_bytes = size_kb * 1024
+    raw_command["command"]["data"]["padding"] = ""
+    missing_size = size_bytes - len(json.dumps(raw_command))
+    raw_command["command"]["data"]["padding"] = "x" * max(missing_size, 0)
+
+    return json.dumps(raw_command).encode()
+
+
+def measure_us(callback: Callable[[], Any]) -> float:
+    return timeit.timeit(callback, number=ITERATIONS) / ITERATIONS * 1_000_000
+
+
+def main() -> None:
+    backend = "orjson" if orjson is not None else "stdlib json (orjson not installed)"
+    print(f"Fast path backend: {backend}")
+    print(f"Iterations per case: {ITERATIONS}\n")
+
+    print(f"{'payload':>8} {'stdlib, us':>12} {'fast, us':>10} {'saved, us':>10}")
+    for size_kb in PAYLOAD_SIZES_KB:
+        raw_command = build_raw_command(size_kb)
+        stdlib_us = measure_us(lambda: json.loads(raw_command))
+        fast_us = measure_us(lambda: json_loads(raw_command))
+        print(
+            f"{size_kb:>6}KB {stdlib_us:>12.2f} {fast_us:>10.2f} "
+            f"{stdlib_us - fast_us:>10.2f}"
+        )
+
+    stdlib_response_us = measure_us(
+        lambda: JSONResponse(build_command_accepted_response(), status_code=202)
+    )
+    fast_response_us = measure_us(command_accepted_response)
+    print(
+        f"\nAccepted response: {stdlib_response_us:.2f}us -> {fast_response_us:.2f}us "
+        f"(saved {stdlib_response_us - fast_response_us:.2f}us per request)"
+    )
+
+
+if __name__ == "__main__":
+    main()
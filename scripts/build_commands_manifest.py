@@ -0,0 +1,38 @@
+"""Write commands manifest used by `LAZY_COMMANDS` mode.
+
+Should be run after adding or changing commands. With `--check` exits with
+error if manifest is outdated.
+
+Run from the project root:
+
+    BOT_CREDENTIALS="cts.example.com@secret@$(uuidgen)" \\
+        PYTHONPATH=. python scripts/build_commands_manifest.py [--check]
+"""
+
+import argparse
+import json
+import sys
+
+from app.bot.commands_loader import COMMAND_MODULE_NAMES, MANIFEST_PATH, build_manifest
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--check", action="store_true")
+    args = parser.parse_args()
+
+    manifest = json.dumps(
+        build_manifest(COMMAND_MODULE_NAMES), indent=2, ensure_ascii=False
+    )
+    manifest = f"{manifest}\n"
+
+    if not args.check:
+        MANIFEST_PATH.write_text(manifest)
+        return
+
+    if not MANIFEST_PATH.exists() or MANIFEST_PATH.read_text() != manifest:
+        sys.exit(f"{MANIFEST_PATH} is outdated, run {sys.argv[0]}")
+
+
+if __name__ == "__main__":
+    main()
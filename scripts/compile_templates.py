@@ -0,0 +1,32 @@
+"""Compile Mako templates, so bot doesn't compile them on start.
+
+Compiled modules are written to `TEMPLATES_MODULE_DIR`, which should be kept
+between bot starts, e.g. directory in Docker image.
+
+Run from the project root:
+
+    BOT_CREDENTIALS="cts.example.com@secret@$(uuidgen)" \\
+        TEMPLATES_MODULE_DIR=compiled-templates \\
+        PYTHONPATH=. python scripts/compile_templates.py
+"""
+
+import sys
+from pathlib import Path
+
+from app.resources.strings import lookup
+from app.settings import settings
+
+TEMPLATES_DIR = Path("app/resources/templates")
+
+
+def main() -> None:
+    if settings.TEMPLATES_MODULE_DIR is None:
+        sys.exit("TEMPLATES_MODULE_DIR isn't set, templates can't be compiled")
+
+    for template_path in sorted(TEMPLATES_DIR.rglob("*.mako")):
+        lookup.get_template(template_path.relative_to(TEMPLATES_DIR).as_posix())
+        print(f"Compiled {template_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,7 @@
+import os
+
+# Settings are validated on import of application modules
+os.environ.setdefault(
+    "BOT_CREDENTIALS",
+    "cts.example.com@secret@123e4567-e89b-12d3-a456-426614174000",
+)
@@ -0,0 +1,106 @@
+import asyncio
+
+import pytest
+
+from app.bot.async_pipe import AsyncPipe
+
+
+async def test_reader_gets_available_bytes() -> None:
+    pipe = AsyncPipe(max_size=100)
+
+    await pipe.write(b"hello")
+    await pipe.write(b" world")
+
+    assert await pipe.read() == b"hello world"
+
+
+async def test_reader_waits_for_written_bytes() -> None:
+    pipe = AsyncPipe(max_size=100)
+
+    read_task = asyncio.create_task(pipe.read())
+    await asyncio.sleep(0)
+    assert not read_task.done()
+
+    await pipe.write(b"hello")
+
+    assert await read_task == b"hello"
+
+
+async def test_chunks_are_split_by_bytes_to_read() -> None:
+    pipe = AsyncPipe(max_size=100)
+
+    await pipe.write(b"hello")
+    await pipe.write(b" world")
+
+    assert await pipe.read(3) == b"hel"
+    assert await pipe.read(4) == b"lo w"
+    assert await pipe.read(100) == b"orld"
+
+
+async def test_writer_waits_while_max_size_is_unread() -> None:
+    pipe = AsyncPipe(max_size=5)
+
+    await pipe.write(b"hello")
+    write_task = asyncio.create_task(pipe.write(b" world"))
+    await asyncio.sleep(0)
+    assert not write_task.done()
+
+    assert await pipe.read(2) == b"he"
+    assert await write_task == 6
+    assert await pipe.read() == b"llo world"
+
+
+async def test_reader_gets_empty_bytes_after_writing_closed() -> None:
+    pipe = AsyncPipe(max_size=100)
+
+    await pipe.write(b"hello")
+    read_task = asyncio.create_task(pipe.read())
+    await pipe.close_writing()
+
+    assert await read_task == b"hello"
+    assert await pipe.read() == b""
+    assert await pipe.read(10) == b""
+
+
+async def test_waiting_reader_is_woken_by_close_writing() -> None:
+    pipe = AsyncPipe(max_size=100)
+
+    read_task = asyncio.create_task(pipe.read())
+    await asyncio.sleep(0)
+    await pipe.close_writing()
+
+    assert await asyncio.wait_for(read_task, timeout=1) == b""
+
+
+@pytest.mark.parametrize("cursor", [0, 3, 100])
+async def test_seek_only_returns_written_size(cursor: int) -> None:
+    pipe = AsyncPipe(max_size=100)
+
+    await pipe.write(b"hello")
+    await pipe.read(2)
+
+    assert await pipe.seek(cursor) == 5
+    assert await pipe.tell() == 5
+    assert pipe.written_size == 5
+    assert await pipe.read() == b"llo"
+
+
+async def test_content_is_waited_before_reading() -> None:
+    pipe = AsyncPipe(max_size=100)
+
+    wait_task = asyncio.create_task(pipe.wait_content())
+    await asyncio.sleep(0)
+    assert not wait_task.done()
+
+    await pipe.write(b"hello")
+
+    assert await wait_task
+    assert await pipe.read() == b"hello"
+
+
+async def test_no_content_after_writing_closed_empty() -> None:
+    pipe = AsyncPipe(max_size=100)
+
+    await pipe.close_writing()
+
+    assert not await pipe.wait_content()
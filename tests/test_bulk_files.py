@@ -0,0 +1,91 @@
+import io
+import zipfile
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import UUID, uuid4
+
+from pybotx.async_buffer import AsyncBufferReadable, AsyncBufferWritable
+
+from app.bot.async_pipe import AsyncPipe
+from app.bot.commands.bulk_files import download_files
+
+
+class FakeBot:
+    def __init__(self, files: Dict[UUID, bytes]) -> None:
+        self.files = files
+        self.archive: Optional[bytes] = None
+        self.answers: List[str] = []
+        self.downloads: List[UUID] = []
+
+    async def download_file(
+        self, *, file_id: UUID, async_buffer: AsyncBufferWritable, **_: Any
+    ) -> None:
+        self.downloads.append(file_id)
+        if file_id not in self.files:
+            raise RuntimeError("File not found")
+
+        await async_buffer.write(self.files[file_id])
+        await async_buffer.seek(0)
+
+    async def upload_file(
+        self, *, async_buffer: AsyncBufferReadable, **_: Any
+    ) -> SimpleNamespace:
+        assert isinstance(async_buffer, AsyncPipe)
+        chunks = []
+        while chunk := await async_buffer.read(1024):
+            chunks.append(chunk)
+
+        self.archive = b"".join(chunks)
+        return SimpleNamespace(_file_id="archive-id")
+
+    async def answer_message(self, text: str) -> None:
+        self.answers.append(text)
+
+
+def build_message(*file_ids: UUID) -> SimpleNamespace:
+    return SimpleNamespace(
+        argument=" ".join(str(file_id) for file_id in file_ids),
+        bot=SimpleNamespace(id=uuid4()),
+        chat=SimpleNamespace(id=uuid4()),
+    )
+
+
+def read_archive(archive: bytes) -> List[Tuple[str, bytes]]:
+    with zipfile.ZipFile(io.BytesIO(archive)) as zip_file:
+        return [(name, zip_file.read(name)) for name in zip_file.namelist()]
+
+
+async def test_repeated_files_are_archived_once() -> None:
+    file_id = uuid4()
+    bot = FakeBot({file_id: b"hello"})
+
+    await download_files(build_message(file_id, file_id), bot)  # type: ignore
+
+    assert bot.downloads == [file_id]
+    assert bot.archive is not None
+    assert read_archive(bot.archive) == [(str(file_id), b"hello")]
+    assert "**Archive:** `archive-id`" in bot.answers[0]
+
+
+async def test_failed_files_are_listed() -> None:
+    file_id, missing_file_id = uuid4(), uuid4()
+    bot = FakeBot({file_id: b"hello"})
+
+    await download_files(build_message(file_id, missing_file_id), bot)  # type: ignore
+
+    assert bot.archive is not None
+    assert read_archive(bot.archive) == [(str(file_id), b"hello")]
+    assert f"**Failed:** {missing_file_id}" in bot.answers[0]
+
+
+async def test_archive_is_not_uploaded_without_downloaded_files() -> None:
+    missing_file_ids = [uuid4(), uuid4()]
+    bot = FakeBot({})
+
+    await download_files(build_message(*missing_file_ids), bot)  # type: ignore
+
+    assert bot.archive is None
+    assert "**Error:** No file was downloaded" in bot.answers[0]
+    assert "**Archive:**" not in bot.answers[0]
+    for missing_file_id in missing_file_ids:
+        assert str(missing_file_id) in bot.answers[0]
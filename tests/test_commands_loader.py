@@ -0,0 +1,82 @@
+import sys
+from types import ModuleType
+from typing import Iterator
+from uuid import uuid4
+
+import pytest
+from pybotx import Bot, ChatTypes, IncomingMessage, StatusRecipient
+
+from app.bot.commands_loader import (
+    COMMANDS_PACKAGE,
+    VISIBLE_FUNC_MARKER,
+    build_lazy_collector,
+    build_manifest,
+    get_command_handler,
+)
+from app.bot.handler_with_help import HandlerCollectorWithHelp
+
+MODULE_NAME = "fake_visibility"
+
+
+def build_status_recipient(is_admin: bool) -> StatusRecipient:
+    return StatusRecipient(
+        bot_id=uuid4(),
+        huid=uuid4(),
+        ad_login=None,
+        ad_domain=None,
+        is_admin=is_admin,
+        chat_type=ChatTypes.PERSONAL_CHAT,
+    )
+
+
+async def check_is_admin(status_recipient: StatusRecipient, _: Bot) -> bool:
+    return bool(status_recipient.is_admin)
+
+
+async def handle_command(_: IncomingMessage, bot: Bot) -> None:
+    """Fake command."""
+
+
+@pytest.fixture
+def commands_module() -> Iterator[None]:
+    collector = HandlerCollectorWithHelp()
+    collector.command("/public", description="Public command")(handle_command)
+    collector.command("/admin", description="Admin command", visible=check_is_admin)(
+        handle_command
+    )
+    collector.command("/hidden", visible=False)(handle_command)
+
+    module = ModuleType(MODULE_NAME)
+    module.collector = collector  # type: ignore[attr-defined]
+    module_path = f"{COMMANDS_PACKAGE}.{MODULE_NAME}"
+    sys.modules[module_path] = module
+    get_command_handler.cache_clear()
+
+    yield
+
+    sys.modules.pop(module_path)
+    get_command_handler.cache_clear()
+
+
+def test_visibility_is_written_to_manifest(commands_module: None) -> None:
+    manifest = build_manifest([MODULE_NAME])
+
+    assert {
+        command_info["command"]: command_info["visible"]
+        for command_info in manifest["commands"]
+    } == {"/public": True, "/admin": VISIBLE_FUNC_MARKER, "/hidden": False}
+
+
+async def test_visibility_function_is_loaded_for_menu(commands_module: None) -> None:
+    lazy_collector = build_lazy_collector(build_manifest([MODULE_NAME]))
+    bot: Bot = object()  # type: ignore[assignment]
+
+    admin_menu = await lazy_collector.get_bot_menu(
+        build_status_recipient(is_admin=True), bot
+    )
+    user_menu = await lazy_collector.get_bot_menu(
+        build_status_recipient(is_admin=False), bot
+    )
+
+    assert set(admin_menu) == {"/public", "/admin"}
+    assert set(user_menu) == {"/public"}
@@ -0,0 +1,109 @@
+import asyncio
+from typing import List
+
+import pytest
+
+from app.bot.dispatch_scheduler import DispatchScheduler
+
+
+class CommandsLog:
+    def __init__(self) -> None:
+        self.events: List[str] = []
+        self.running_count = 0
+        self.max_running_count = 0
+
+    async def handle(self, name: str, delay: float = 0.01) -> None:
+        self.running_count += 1
+        self.max_running_count = max(self.max_running_count, self.running_count)
+        self.events.append(f"start {name}")
+        try:  # noqa: WPS501
+            await asyncio.sleep(delay)
+        finally:
+            self.running_count -= 1
+            self.events.append(f"end {name}")
+
+
+async def test_commands_of_chat_run_in_order_one_by_one() -> None:
+    scheduler = DispatchScheduler(workers_count=10)
+    commands_log = CommandsLog()
+
+    await asyncio.gather(
+        *(scheduler.run("chat", commands_log.handle, str(index)) for index in range(3))
+    )
+
+    assert commands_log.events == [
+        "start 0",
+        "end 0",
+        "start 1",
+        "end 1",
+        "start 2",
+        "end 2",
+    ]
+
+
+async def test_chats_run_in_parallel_up_to_workers_count() -> None:
+    scheduler = DispatchScheduler(workers_count=2)
+    commands_log = CommandsLog()
+
+    await asyncio.gather(
+        *(
+            scheduler.run(f"chat {index}", commands_log.handle, str(index))
+            for index in range(5)
+        )
+    )
+
+    assert commands_log.max_running_count == 2
+    assert len(commands_log.events) == 10
+
+
+async def test_commands_without_chat_are_not_ordered() -> None:
+    scheduler = DispatchScheduler(workers_count=10)
+    commands_log = CommandsLog()
+
+    await asyncio.gather(
+        *(scheduler.run(None, commands_log.handle, str(index)) for index in range(3))
+    )
+
+    assert commands_log.max_running_count == 3
+
+
+async def test_failed_command_doesnt_block_chat() -> None:
+    scheduler = DispatchScheduler(workers_count=1)
+    commands_log = CommandsLog()
+
+    async def fail() -> None:  # noqa: WPS430
+        raise ValueError
+
+    failed_task = asyncio.create_task(scheduler.run("chat", fail))
+    await scheduler.run("chat", commands_log.handle, "next")
+
+    with pytest.raises(ValueError):
+        await failed_task
+
+    assert commands_log.events == ["start next", "end next"]
+    assert scheduler.get_stats() == {
+        "workers": 1,
+        "running_commands": 0,
+        "chats_with_commands": 0,
+    }
+
+
+async def test_cancelled_waiting_command_is_skipped() -> None:
+    scheduler = DispatchScheduler(workers_count=1)
+    commands_log = CommandsLog()
+
+    first_task = asyncio.create_task(
+        scheduler.run("chat", commands_log.handle, "first", 0.05)
+    )
+    cancelled_task = asyncio.create_task(
+        scheduler.run("chat", commands_log.handle, "cancelled")
+    )
+    await asyncio.sleep(0.01)
+    assert scheduler.get_stats()["chats_with_commands"] == 1
+
+    cancelled_task.cancel()
+    await scheduler.run("chat", commands_log.handle, "last")
+    await first_task
+
+    assert commands_log.events == ["start first", "end first", "start last", "end last"]
+    assert scheduler.get_stats()["chats_with_commands"] == 0
@@ -0,0 +1,72 @@
+import httpcore
+import httpx
+import pytest
+
+from app.bot.http_client import (
+    DEFAULT_POOL_LABEL,
+    PoolsHTTPClient,
+    PoolTransport,
+    build_httpx_client,
+    get_pool_stats,
+)
+
+CTS_URLS = ("https://cts.example.com", "https://cts.internal.example.com")
+
+
+def build_client() -> PoolsHTTPClient:
+    return build_httpx_client(
+        CTS_URLS,
+        max_connections=10,
+        max_keepalive_connections=5,
+        keepalive_expiry=5,
+        connect_timeout=5,
+        read_timeout=5,
+        write_timeout=5,
+        pool_timeout=5,
+        http2=False,
+    )
+
+
+def is_proxied(transport: PoolTransport) -> bool:
+    return isinstance(transport._pool, httpcore.AsyncHTTPProxy)  # noqa: WPS437
+
+
+@pytest.fixture(autouse=True)
+def clear_proxy_env(monkeypatch: pytest.MonkeyPatch) -> None:
+    for env_name in ("HTTP_PROXY", "HTTPS_PROXY", "ALL_PROXY", "NO_PROXY"):
+        monkeypatch.delenv(env_name, raising=False)
+        monkeypatch.delenv(env_name.lower(), raising=False)
+
+
+def test_each_cts_host_has_own_pool() -> None:
+    httpx_client = build_client()
+
+    assert set(get_pool_stats(httpx_client)) == {
+        DEFAULT_POOL_LABEL,
+        "cts.example.com",
+        "cts.internal.example.com",
+    }
+    assert get_pool_stats(httpx_client)["cts.example.com"] == {
+        "open": 0,
+        "idle": 0,
+        "active": 0,
+    }
+
+
+def test_cts_hosts_use_proxy_from_environment(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setenv("HTTPS_PROXY", "http://proxy.example.com:3128")
+    monkeypatch.setenv("NO_PROXY", "internal.example.com")
+
+    httpx_client = build_client()
+    pool_transports = httpx_client.pool_transports
+
+    assert is_proxied(pool_transports["cts.example.com"])
+    assert not is_proxied(pool_transports["cts.internal.example.com"])
+    assert is_proxied(pool_transports["proxy https://"])
+    assert not is_proxied(pool_transports[DEFAULT_POOL_LABEL])
+
+
+def test_other_client_has_no_pool_stats() -> None:
+    assert get_pool_stats(httpx.AsyncClient()) == {}
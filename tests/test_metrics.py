@@ -0,0 +1,46 @@
+from app.metrics import Histogram, MetricsRegistry
+
+
+def test_counter_is_rendered_per_label_values() -> None:
+    registry = MetricsRegistry(prefix="bot_")
+    counter = registry.counter("errors_total", "Errors.", ["exception"])
+
+    counter.inc("ValueError")
+    counter.inc("ValueError", amount=2)
+    counter.inc('Quote"Error')
+
+    rendered_lines = registry.render().splitlines()
+
+    assert rendered_lines[:2] == [
+        "# HELP bot_errors_total Errors.",
+        "# TYPE bot_errors_total counter",
+    ]
+    assert 'bot_errors_total{exception="ValueError"} 3' in rendered_lines
+    assert 'bot_errors_total{exception="Quote\\"Error"} 1' in rendered_lines
+
+
+def test_histogram_buckets_are_cumulative() -> None:
+    histogram = Histogram("duration", "Duration.", buckets=(5, 1))
+
+    for observed_value in (0.5, 1, 3, 10):
+        histogram.observe(observed_value)
+
+    assert list(histogram.collect())[2:] == [
+        'duration_bucket{le="1"} 2',
+        'duration_bucket{le="5"} 3',
+        'duration_bucket{le="+Inf"} 4',
+        "duration_sum 14.5",
+        "duration_count 4",
+    ]
+
+
+def test_stats_sources_are_read_on_render() -> None:
+    registry = MetricsRegistry(prefix="bot_")
+    stats = {"hits": 1}
+    registry.add_stats_source("cache", lambda: stats)
+
+    assert "bot_cache_hits 1" in registry.render()
+
+    stats["hits"] = 2
+
+    assert "bot_cache_hits 2" in registry.render()
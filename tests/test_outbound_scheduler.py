@@ -0,0 +1,339 @@
+import asyncio
+from time import monotonic
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Tuple
+from uuid import UUID, uuid4
+
+import httpx
+import pytest
+from pybotx.client.exceptions.http import InvalidBotXStatusCodeError
+from pydantic import ValidationError
+
+from app.bot import outbound_scheduler as outbound_scheduler_module
+from app.bot.outbound_scheduler import (
+    OutboundQueueFullError,
+    OutboundScheduler,
+    TokenBucket,
+    bulk_sends,
+)
+from app.settings import AppSettings
+
+BOT_ID = uuid4()
+
+
+def build_status_code_error(
+    status_code: int, headers: Dict[str, str]
+) -> InvalidBotXStatusCodeError:
+    request = httpx.Request("POST", "https://cts.example.com/api/v4/botx/notifications")
+    return InvalidBotXStatusCodeError(
+        httpx.Response(status_code, headers=headers, request=request)
+    )
+
+
+class SendsLog:
+    def __init__(self) -> None:
+        self.sent: List[str] = []
+        self.sent_at: List[float] = []
+
+    def build_send(self, name: str) -> Callable[[], Awaitable[str]]:
+        async def send() -> str:  # noqa: WPS430
+            self.sent.append(name)
+            self.sent_at.append(monotonic())
+            return name
+
+        return send
+
+
+@pytest.fixture
+async def build_scheduler() -> AsyncIterator[Callable[..., OutboundScheduler]]:
+    schedulers: List[OutboundScheduler] = []
+
+    def build(**kwargs: float) -> OutboundScheduler:  # noqa: WPS430
+        options: Dict[str, float] = {
+            "bot_rate": 1000,
+            "bot_burst": 1000,
+            "chat_rate": 1000,
+            "chat_burst": 1000,
+            "queue_max_size": 100,
+            **kwargs,
+        }
+        scheduler = OutboundScheduler(**options)  # type: ignore[arg-type]
+        scheduler.start()
+        schedulers.append(scheduler)
+        return scheduler
+
+    yield build
+
+    for scheduler in schedulers:
+        await scheduler.stop()
+
+
+def test_token_bucket_refills_with_rate() -> None:
+    bucket = TokenBucket(rate=10, capacity=2)
+    now = monotonic()
+
+    for _ in range(2):
+        assert bucket.get_delay(now) == 0
+        bucket.take()
+
+    assert bucket.get_delay(now) == pytest.approx(0.1)
+    assert bucket.get_delay(now + 0.1) == pytest.approx(0)
+    assert not bucket.is_full(now + 0.1)
+    assert bucket.is_full(now + 1)
+
+
+def test_paused_token_bucket_waits_for_pause_end(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(outbound_scheduler_module, "monotonic", lambda: 100.0)
+    bucket = TokenBucket(rate=10, capacity=2)
+
+    bucket.pause(5)
+
+    assert bucket.get_delay(101) == 4
+    assert bucket.get_delay(105) == pytest.approx(0.1)
+
+
+def test_token_bucket_with_zero_rate_is_unlimited() -> None:
+    bucket = TokenBucket(rate=0, capacity=1)
+    now = monotonic()
+
+    for _ in range(3):
+        assert bucket.get_delay(now) == 0
+        bucket.take()
+
+    assert bucket.is_full(now)
+
+
+@pytest.mark.parametrize("rate_name", ["OUTBOUND_BOT_RATE", "OUTBOUND_CHAT_RATE"])
+def test_negative_rate_is_rejected(rate_name: str) -> None:
+    with pytest.raises(ValidationError):
+        AppSettings(**{rate_name: -1})
+
+
+async def test_messages_are_sent_directly_if_not_started() -> None:
+    scheduler = OutboundScheduler(1, 1, 1, 1, queue_max_size=0)
+    sends_log = SendsLog()
+
+    for index in range(3):
+        await scheduler.run(BOT_ID, uuid4(), sends_log.build_send(str(index)))
+
+    assert sends_log.sent == ["0", "1", "2"]
+
+
+async def test_chat_burst_is_sent_at_once_and_rest_with_rate(
+    build_scheduler: Callable[..., OutboundScheduler],
+) -> None:
+    scheduler = build_scheduler(chat_rate=20, chat_burst=2)
+    sends_log = SendsLog()
+    chat_id = uuid4()
+    started_at = monotonic()
+
+    sent = await asyncio.gather(
+        *(
+            scheduler.run(BOT_ID, chat_id, sends_log.build_send(str(index)))
+            for index in range(4)
+        )
+    )
+
+    assert sent == ["0", "1", "2", "3"]
+    delays = [sent_at - started_at for sent_at in sends_log.sent_at]
+    assert delays[1] < 0.04
+    assert delays[2] >= 0.04
+    assert delays[3] >= 0.09
+
+
+async def test_zero_chat_rate_is_unlimited(
+    build_scheduler: Callable[..., OutboundScheduler],
+) -> None:
+    scheduler = build_scheduler(chat_rate=0, chat_burst=1)
+    sends_log = SendsLog()
+    chat_id = uuid4()
+
+    await asyncio.wait_for(
+        asyncio.gather(
+            *(
+                scheduler.run(BOT_ID, chat_id, sends_log.build_send(str(index)))
+                for index in range(5)
+            )
+        ),
+        timeout=1,
+    )
+
+    assert sends_log.sent == ["0", "1", "2", "3", "4"]
+
+
+async def test_granting_error_fails_only_its_send(
+    build_scheduler: Callable[..., OutboundScheduler],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    scheduler = build_scheduler()
+    sends_log = SendsLog()
+    broken_chat_id = uuid4()
+    get_chat_bucket = scheduler._get_chat_bucket  # noqa: WPS437
+
+    def get_broken_chat_bucket(chat_key: Tuple[UUID, UUID]) -> TokenBucket:
+        if chat_key[1] == broken_chat_id:
+            raise RuntimeError("Broken bucket")
+        return get_chat_bucket(chat_key)
+
+    monkeypatch.setattr(scheduler, "_get_chat_bucket", get_broken_chat_bucket)
+
+    with pytest.raises(RuntimeError, match="Broken bucket"):
+        await asyncio.wait_for(
+            scheduler.run(BOT_ID, broken_chat_id, sends_log.build_send("broken")),
+            timeout=1,
+        )
+    await asyncio.wait_for(
+        scheduler.run(BOT_ID, uuid4(), sends_log.build_send("next")), timeout=1
+    )
+
+    assert sends_log.sent == ["next"]
+    assert scheduler.get_stats()["pending_sends"] == 0
+
+
+async def test_interactive_messages_are_sent_before_bulk(
+    build_scheduler: Callable[..., OutboundScheduler],
+) -> None:
+    scheduler = build_scheduler(bot_rate=20, bot_burst=1)
+    sends_log = SendsLog()
+
+    await scheduler.run(BOT_ID, uuid4(), sends_log.build_send("first"))
+    with bulk_sends():
+        bulk_task = asyncio.create_task(
+            scheduler.run(BOT_ID, uuid4(), sends_log.build_send("bulk"))
+        )
+    await asyncio.sleep(0)
+    await scheduler.run(BOT_ID, uuid4(), sends_log.build_send("interactive"))
+    await bulk_task
+
+    assert sends_log.sent == ["first", "interactive", "bulk"]
+
+
+async def test_chats_are_served_in_round_robin(
+    build_scheduler: Callable[..., OutboundScheduler],
+) -> None:
+    scheduler = build_scheduler(bot_rate=50, bot_burst=1)
+    sends_log = SendsLog()
+    busy_chat_id, other_chat_id = uuid4(), uuid4()
+
+    await scheduler.run(BOT_ID, busy_chat_id, sends_log.build_send("warmup"))
+    busy_chat_sends = [
+        asyncio.create_task(
+            scheduler.run(BOT_ID, busy_chat_id, sends_log.build_send(f"busy {index}"))
+        )
+        for index in range(3)
+    ]
+    await asyncio.sleep(0)
+    await scheduler.run(BOT_ID, other_chat_id, sends_log.build_send("other"))
+    await asyncio.gather(*busy_chat_sends)
+
+    assert sends_log.sent == ["warmup", "busy 0", "other", "busy 1", "busy 2"]
+
+
+async def test_throttled_message_is_retried_after_pause(
+    build_scheduler: Callable[..., OutboundScheduler],
+) -> None:
+    scheduler = build_scheduler()
+    attempts_at: List[float] = []
+
+    async def send() -> str:  # noqa: WPS430
+        attempts_at.append(monotonic())
+        if len(attempts_at) == 1:
+            raise build_status_code_error(429, {"Retry-After": "0.05"})
+        return "sent"
+
+    assert await scheduler.run(BOT_ID, uuid4(), send) == "sent"
+    assert attempts_at[1] - attempts_at[0] >= 0.04
+    assert scheduler.get_stats()["throttled_responses"] == 1
+
+
+async def test_last_retry_error_is_raised(
+    build_scheduler: Callable[..., OutboundScheduler],
+) -> None:
+    scheduler = build_scheduler(default_retry_after=0.001)
+    attempts_count = 0
+
+    async def send() -> None:  # noqa: WPS430
+        nonlocal attempts_count
+        attempts_count += 1
+        raise build_status_code_error(429, {})
+
+    with pytest.raises(InvalidBotXStatusCodeError):
+        await scheduler.run(BOT_ID, uuid4(), send)
+
+    assert attempts_count == 4
+
+
+async def test_other_errors_are_not_retried(
+    build_scheduler: Callable[..., OutboundScheduler],
+) -> None:
+    scheduler = build_scheduler()
+    attempts_count = 0
+
+    async def send() -> None:  # noqa: WPS430
+        nonlocal attempts_count
+        attempts_count += 1
+        raise build_status_code_error(500, {})
+
+    with pytest.raises(InvalidBotXStatusCodeError):
+        await scheduler.run(BOT_ID, uuid4(), send)
+
+    assert attempts_count == 1
+
+
+async def test_send_fails_if_queue_is_full(
+    build_scheduler: Callable[..., OutboundScheduler],
+) -> None:
+    scheduler = build_scheduler(bot_rate=1, bot_burst=1, queue_max_size=1)
+    sends_log = SendsLog()
+
+    await scheduler.run(BOT_ID, uuid4(), sends_log.build_send("first"))
+    waiting_task = asyncio.create_task(
+        scheduler.run(BOT_ID, uuid4(), sends_log.build_send("waiting"))
+    )
+    await asyncio.sleep(0)
+
+    with pytest.raises(OutboundQueueFullError):
+        await scheduler.run(BOT_ID, uuid4(), sends_log.build_send("rejected"))
+
+    assert scheduler.get_stats()["rejected_sends"] == 1
+
+    waiting_task.cancel()
+
+
+async def test_cancelled_waiting_send_leaves_queue(
+    build_scheduler: Callable[..., OutboundScheduler],
+) -> None:
+    scheduler = build_scheduler(bot_rate=20, bot_burst=1)
+    sends_log = SendsLog()
+
+    await scheduler.run(BOT_ID, uuid4(), sends_log.build_send("first"))
+    cancelled_task = asyncio.create_task(
+        scheduler.run(BOT_ID, uuid4(), sends_log.build_send("cancelled"))
+    )
+    await asyncio.sleep(0)
+    cancelled_task.cancel()
+    await scheduler.run(BOT_ID, uuid4(), sends_log.build_send("last"))
+
+    assert sends_log.sent == ["first", "last"]
+    assert scheduler.get_stats()["pending_sends"] == 0
+
+
+async def test_stop_cancels_waiting_sends() -> None:
+    scheduler = OutboundScheduler(1, 1, 1, 1, queue_max_size=10)
+    scheduler.start()
+    sends_log = SendsLog()
+    chat_id: UUID = uuid4()
+
+    await scheduler.run(BOT_ID, chat_id, sends_log.build_send("first"))
+    waiting_task = asyncio.create_task(
+        scheduler.run(BOT_ID, chat_id, sends_log.build_send("waiting"))
+    )
+    await asyncio.sleep(0)
+    await scheduler.stop()
+
+    with pytest.raises(asyncio.CancelledError):
+        await waiting_task
+
+    assert sends_log.sent == ["first"]
+    assert scheduler.get_stats()["pending_sends"] == 0
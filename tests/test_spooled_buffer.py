@@ -0,0 +1,56 @@
+import os
+
+from app.bot.spooled_buffer import SpooledAsyncBuffer
+
+
+async def test_small_content_is_kept_in_memory() -> None:
+    async with SpooledAsyncBuffer(max_size=10) as async_buffer:
+        await async_buffer.write(b"hello")
+        await async_buffer.write(b"world")
+
+        assert async_buffer.in_memory
+        assert await async_buffer.tell() == 10
+
+        await async_buffer.seek(0)
+        assert await async_buffer.read() == b"helloworld"
+
+
+async def test_big_content_is_moved_to_disk() -> None:
+    async with SpooledAsyncBuffer(max_size=10) as async_buffer:
+        await async_buffer.write(b"hello")
+        await async_buffer.write(b"big world")
+
+        assert not async_buffer.in_memory
+        assert await async_buffer.tell() == 14
+
+        await async_buffer.seek(0)
+        assert await async_buffer.read() == b"hellobig world"
+
+
+async def test_position_is_kept_after_rollover() -> None:
+    async with SpooledAsyncBuffer(max_size=10) as async_buffer:
+        await async_buffer.write(b"hello world")
+        await async_buffer.seek(6)
+        await async_buffer.write(b"there, friend")
+
+        assert not async_buffer.in_memory
+
+        await async_buffer.seek(0)
+        assert await async_buffer.read() == b"hello there, friend"
+
+
+async def test_content_is_read_by_parts() -> None:
+    async with SpooledAsyncBuffer(max_size=4) as async_buffer:
+        await async_buffer.write(b"hello world")
+        await async_buffer.seek(-5, os.SEEK_END)
+
+        assert await async_buffer.read(3) == b"wor"
+        assert await async_buffer.read(3) == b"ld"
+        assert await async_buffer.read(3) == b""
+
+
+async def test_buffer_is_closed_on_exit() -> None:
+    async with SpooledAsyncBuffer(max_size=4) as async_buffer:
+        await async_buffer.write(b"hello world")
+
+    assert async_buffer._buffer.closed  # noqa: WPS437
@@ -0,0 +1,140 @@
+import stat
+from pathlib import Path
+from uuid import uuid4
+
+import pytest
+from pybotx import BotAccountWithSecret, UnknownBotAccountError
+
+from app.bot.datastructures import CTSEventsListeners, DebugSubscribers
+from app.bot.shared_bot_accounts_storage import SharedBotAccountsStorage
+from app.bot.state_store import MemoryStateStore, SQLiteStateStore, StateStore
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def state_store(request: pytest.FixtureRequest, tmp_path: Path) -> StateStore:
+    if request.param == "memory":
+        return MemoryStateStore()
+
+    return SQLiteStateStore(tmp_path / "state.db")
+
+
+def build_bot_account() -> BotAccountWithSecret:
+    return BotAccountWithSecret(
+        id=uuid4(), cts_url="https://cts.example.com", secret_key="secret"
+    )
+
+
+def test_members_are_grouped_by_namespace_and_key(state_store: StateStore) -> None:
+    state_store.add("listeners", "host", "first")
+    state_store.add("listeners", "host", "first")
+    state_store.add("listeners", "host", "second")
+    state_store.add("listeners", "other_host", "third")
+    state_store.add("subscribers", "host", "fourth")
+
+    assert state_store.get_members("listeners", "host") == {"first", "second"}
+    assert state_store.has_members("listeners", "other_host")
+    assert not state_store.has_members("listeners", "unknown_host")
+    assert state_store.get_members("listeners", "unknown_host") == set()
+
+
+def test_remove_reports_if_member_was_there(state_store: StateStore) -> None:
+    state_store.add("listeners", "host", "member")
+
+    assert state_store.remove("listeners", "host", "member")
+    assert not state_store.remove("listeners", "host", "member")
+    assert not state_store.has_members("listeners", "host")
+
+
+def test_got_members_are_copy(state_store: StateStore) -> None:
+    state_store.add("listeners", "host", "member")
+
+    state_store.get_members("listeners", "host").clear()
+
+    assert state_store.get_members("listeners", "host") == {"member"}
+
+
+def test_sqlite_store_is_shared_between_connections(tmp_path: Path) -> None:
+    first_store = SQLiteStateStore(tmp_path / "state.db")
+    second_store = SQLiteStateStore(tmp_path / "state.db")
+
+    first_store.add("listeners", "host", "member")
+
+    assert second_store.get_members("listeners", "host") == {"member"}
+
+    second_store.remove("listeners", "host", "member")
+
+    assert not first_store.has_members("listeners", "host")
+
+
+def test_cts_events_listeners_removing_unknown_chat_fails() -> None:
+    listeners = CTSEventsListeners(MemoryStateStore())
+    chat_id = uuid4()
+
+    listeners.add("host", chat_id)
+
+    assert listeners.get("host") == {chat_id}
+
+    listeners.remove("host", chat_id)
+
+    with pytest.raises(KeyError):
+        listeners.remove("host", chat_id)
+
+
+def test_debug_subscribers_toggle() -> None:
+    subscribers = DebugSubscribers(MemoryStateStore())
+    subscriber_id = uuid4()
+    chat_id = uuid4()
+
+    assert subscribers.toggle(subscriber_id, chat_id)
+    assert subscribers.get(chat_id) == {subscriber_id}
+    assert not subscribers.toggle(subscriber_id, chat_id)
+    assert not subscribers.has_subscribers(chat_id)
+
+
+def test_bot_account_added_by_other_worker_is_found(state_store: StateStore) -> None:
+    initial_bot_account = build_bot_account()
+    added_bot_account = build_bot_account()
+    first_storage = SharedBotAccountsStorage([initial_bot_account], state_store)
+    second_storage = SharedBotAccountsStorage([initial_bot_account], state_store)
+
+    first_storage.add_bot_account(added_bot_account)
+
+    assert second_storage.get_bot_account(added_bot_account.id) == added_bot_account
+    assert list(second_storage.iter_bot_accounts()) == [
+        initial_bot_account,
+        added_bot_account,
+    ]
+
+
+def test_unknown_bot_account_is_still_unknown(state_store: StateStore) -> None:
+    storage = SharedBotAccountsStorage([build_bot_account()], state_store)
+
+    with pytest.raises(UnknownBotAccountError):
+        storage.get_bot_account(uuid4())
+
+
+def test_added_bot_account_replaces_one_with_same_id(state_store: StateStore) -> None:
+    bot_account = build_bot_account()
+    rotated_bot_account = bot_account.copy(update={"secret_key": "new secret"})
+    first_storage = SharedBotAccountsStorage([], state_store)
+    second_storage = SharedBotAccountsStorage([], state_store)
+
+    first_storage.add_bot_account(bot_account)
+    assert list(second_storage.iter_bot_accounts()) == [bot_account]
+    second_storage.set_token(bot_account.id, "token")
+
+    first_storage.add_bot_account(rotated_bot_account)
+    first_storage.add_bot_account(rotated_bot_account)
+
+    assert list(first_storage.iter_bot_accounts()) == [rotated_bot_account]
+    assert list(second_storage.iter_bot_accounts()) == [rotated_bot_account]
+    assert second_storage.get_token_or_none(bot_account.id) is None
+    assert len(state_store.get_members("bot_accounts", "added")) == 1
+
+
+def test_sqlite_store_is_readable_by_owner_only(tmp_path: Path) -> None:
+    db_path = tmp_path / "state.db"
+
+    SQLiteStateStore(db_path).add("bot_accounts", "added", "secret")
+
+    assert stat.S_IMODE(db_path.stat().st_mode) == 0o600
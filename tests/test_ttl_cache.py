@@ -0,0 +1,64 @@
+import pytest
+
+from app.bot import datastructures
+from app.bot.datastructures import TTLCache
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> FakeClock:
+    fake_clock = FakeClock()
+    monkeypatch.setattr(datastructures, "monotonic", fake_clock)
+    return fake_clock
+
+
+def test_entry_expires_after_ttl(clock: FakeClock) -> None:
+    cache: TTLCache[str, int] = TTLCache(ttl=10, max_size=10)
+    cache.set("key", 1)
+
+    clock.now = 9.9
+    assert cache.get("key") == 1
+
+    clock.now = 10
+    assert cache.get("key") is None
+    assert cache.get_stats() == {"hits": 1, "misses": 1, "size": 0}
+
+
+def test_least_recently_used_entry_is_evicted(clock: FakeClock) -> None:
+    cache: TTLCache[str, int] = TTLCache(ttl=10, max_size=2)
+    cache.set("first", 1)
+    cache.set("second", 2)
+
+    assert cache.get("first") == 1
+
+    cache.set("third", 3)
+
+    assert cache.get("second") is None
+    assert cache.get("first") == 1
+    assert cache.get("third") == 3
+
+
+@pytest.mark.parametrize(("ttl", "max_size"), [(0, 10), (10, 0)])
+def test_zero_ttl_or_size_disables_caching(
+    clock: FakeClock, ttl: float, max_size: int
+) -> None:
+    cache: TTLCache[str, int] = TTLCache(ttl=ttl, max_size=max_size)
+    cache.set("key", 1)
+
+    assert cache.get("key") is None
+
+
+def test_clear_drops_entries(clock: FakeClock) -> None:
+    cache: TTLCache[str, int] = TTLCache(ttl=10, max_size=10)
+    cache.set("key", 1)
+
+    cache.clear()
+
+    assert cache.get("key") is None
@@ -0,0 +1,116 @@
+import asyncio
+import io
+import os
+import zipfile
+from typing import Dict
+
+from pybotx.constants import CHUNK_SIZE
+
+from app.bot.async_pipe import AsyncPipe
+from app.bot.file_transfers import (
+    MEGABYTE,
+    TransferResult,
+    format_report,
+    run_transfers,
+)
+from app.bot.spooled_buffer import SpooledAsyncBuffer
+from app.bot.zip_stream import ZipStreamWriter
+
+
+async def read_all(pipe: AsyncPipe) -> bytes:
+    chunks = []
+    while chunk := await pipe.read(1024):
+        chunks.append(chunk)
+
+    return b"".join(chunks)
+
+
+async def write_archive(pipe: AsyncPipe, files: Dict[str, bytes]) -> None:
+    zip_writer = ZipStreamWriter(pipe)
+    try:  # noqa: WPS501
+        for name, content in files.items():
+            async with SpooledAsyncBuffer() as async_buffer:
+                await async_buffer.write(content)
+                await async_buffer.seek(0)
+                await zip_writer.add_file(name, async_buffer)
+
+        await zip_writer.close()
+    finally:
+        await pipe.close_writing()
+
+
+async def test_archive_is_streamed_through_pipe() -> None:
+    files = {
+        "empty.txt": b"",
+        "hello.txt": b"hello world",
+        "big.bin": os.urandom(CHUNK_SIZE * 2 + 1),
+    }
+    # Pipe is much smaller than archive, so it is written and read by parts
+    pipe = AsyncPipe(max_size=4096)
+
+    archive, _ = await asyncio.gather(read_all(pipe), write_archive(pipe, files))
+
+    assert pipe.written_size == len(archive)
+    with zipfile.ZipFile(io.BytesIO(archive)) as zip_file:
+        assert zip_file.testzip() is None
+        assert zip_file.namelist() == list(files)
+        for name, content in files.items():
+            assert zip_file.read(name) == content
+
+
+async def test_concurrently_added_files_are_not_interleaved() -> None:
+    files = {f"{index}.txt": os.urandom(10000) for index in range(5)}
+    pipe = AsyncPipe(max_size=1024)
+    zip_writer = ZipStreamWriter(pipe)
+
+    async def add_file(name: str) -> None:  # noqa: WPS430
+        async with SpooledAsyncBuffer() as async_buffer:
+            await async_buffer.write(files[name])
+            await async_buffer.seek(0)
+            await zip_writer.add_file(name, async_buffer)
+
+    async def write_files() -> None:  # noqa: WPS430
+        await asyncio.gather(*(add_file(name) for name in files))
+        await zip_writer.close()
+        await pipe.close_writing()
+
+    archive, _ = await asyncio.gather(read_all(pipe), write_files())
+
+    with zipfile.ZipFile(io.BytesIO(archive)) as zip_file:
+        assert sorted(zip_file.namelist()) == sorted(files)
+        for name, content in files.items():
+            assert zip_file.read(name) == content
+
+
+async def test_transfers_concurrency_is_limited() -> None:
+    running_count = 0
+    max_running_count = 0
+
+    async def transfer(name: str) -> TransferResult:  # noqa: WPS430
+        nonlocal running_count, max_running_count
+        running_count += 1
+        max_running_count = max(max_running_count, running_count)
+        await asyncio.sleep(0.01)
+        running_count -= 1
+        return TransferResult(name=name)
+
+    transfer_results = await run_transfers(transfer, ["a", "b", "c", "d", "e"], 2)
+
+    assert [result_row.name for result_row in transfer_results] == list("abcde")
+    assert max_running_count == 2
+
+
+def test_report_contains_totals() -> None:
+    transfer_results = [
+        TransferResult(name="first", size=MEGABYTE, elapsed=1),
+        TransferResult(name="second", size=MEGABYTE * 3, elapsed=2),
+        TransferResult(name="third", elapsed=1, error="HTTPError"),
+    ]
+
+    report = format_report(transfer_results, elapsed=2)
+
+    assert "first" in report
+    assert "HTTPError" in report
+    assert report.endswith(
+        "**Total:** 4.00 MB in 2.00s (2.00 MB/s), failed: 1\n**Failed:** third",
+    )